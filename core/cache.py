@@ -0,0 +1,94 @@
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+
+from core.resource_versions import forget_resource_versions
+
+# Seconds a read tool result is reused for identical arguments
+READ_CACHE_TTL = 3.0
+
+# Maximum number of cached results kept per context
+READ_CACHE_MAXSIZE = 1024
+
+# context name -> {(function name, args, kwargs): (time.monotonic() deadline, result)}
+_read_cache: Dict[str, Dict[Tuple, Tuple[float, Any]]] = {}
+_read_cache_lock = threading.Lock()
+
+
+def ttl_cache(func: Callable) -> Callable:
+    """
+    Decorator that reuses the result of a read tool for READ_CACHE_TTL seconds.
+
+    Results are keyed on the function name and its arguments and grouped by context,
+    so invalidate() can drop everything cached for one cluster. Apply it below
+    use_current_context so the resolved context and namespace are part of the key.
+    Cached results are shared between callers and must not be mutated.
+
+    Args:
+        func: The read tool to decorate
+
+    Returns:
+        The decorated function
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        context_name = kwargs.get('context_name', args[0] if args else None)
+        key = (name, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+
+        with _read_cache_lock:
+            entry = _read_cache.get(context_name, {}).get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        result = func(*args, **kwargs)
+
+        with _read_cache_lock:
+            entries = _read_cache.setdefault(context_name, {})
+            if len(entries) >= READ_CACHE_MAXSIZE:
+                # Drop expired entries first, then the oldest ones
+                for stale in [k for k, (deadline, _) in entries.items() if deadline <= now]:
+                    del entries[stale]
+                while len(entries) >= READ_CACHE_MAXSIZE:
+                    del entries[next(iter(entries))]
+            entries[key] = (now + READ_CACHE_TTL, result)
+        return result
+
+    return wrapper
+
+
+def invalidate(context_name: str) -> None:
+    """
+    Drop every cached read result for a context, along with the resourceVersions
+    remembered for it, so reads after a write see that write.
+
+    Args:
+        context_name: The Kubernetes context name
+    """
+    with _read_cache_lock:
+        _read_cache.pop(context_name, None)
+    forget_resource_versions(context_name)
+
+
+def invalidates_cache(func: Callable) -> Callable:
+    """
+    Decorator for write tools that invalidates the read cache of their context
+    once the write has been attempted, whether or not it succeeded.
+
+    Args:
+        func: The write tool to decorate
+
+    Returns:
+        The decorated function
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            invalidate(kwargs.get('context_name', args[0] if args else None))
+
+    return wrapper
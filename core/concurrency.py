@@ -0,0 +1,119 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List
+
+import anyio.to_thread
+
+from core.serialization import to_text_content
+
+# Upper bound on concurrent API requests issued by fan-out helpers. Kept below
+# CONNECTION_POOL_MAXSIZE so parallel calls to one context never wait for a socket.
+FANOUT_MAX_WORKERS = 16
+
+# Number of contexts queried at once by the multi-context batch tools
+BATCH_MAX_CONTEXTS = 8
+
+_executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="k8s-pilot-fanout")
+
+# Separate pool for per-context tasks: they may fan out on _executor themselves, and
+# sharing one bounded pool between the two levels could deadlock.
+_batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_CONTEXTS, thread_name_prefix="k8s-pilot-batch")
+
+
+def run_concurrently(*calls: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent blocking calls (typically Kubernetes API requests) in parallel.
+
+    The wall time is that of the slowest call rather than the sum of all of them.
+    Results are returned in the order of the calls. If any call raises, the exception
+    of the first failing call (in argument order) is re-raised.
+
+    Args:
+        *calls: Zero-argument callables, e.g. functools.partial(core_v1.list_namespaced_pod, namespace)
+
+    Returns:
+        The results of the calls, in order
+    """
+    futures = [_executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+def run_per_context(func: Callable[..., Any], context_names: Iterable[str], **kwargs) -> Dict[str, Any]:
+    """
+    Call a tool function for several contexts in parallel.
+
+    Each context is queried independently: a failure in one context is reported as
+    {"error": ...} for that context and does not affect the others.
+
+    Args:
+        func: The tool function, called as func(context_name=name, **kwargs); for a tool
+            decorated with runs_in_thread, the blocking function it wraps is called
+        context_names: The Kubernetes context names; duplicates are queried once
+        **kwargs: Extra keyword arguments passed to every call
+
+    Returns:
+        A dict mapping each context name to its result
+    """
+    if inspect.iscoroutinefunction(func):
+        # A tool decorated with runs_in_thread: call the blocking function it wraps, so
+        # results are returned as values rather than encoded content
+        func = func.__wrapped__
+    futures = {
+        name: _batch_executor.submit(func, context_name=name, **kwargs)
+        for name in dict.fromkeys(context_names)
+    }
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    return results
+
+
+def run_per_item(func: Callable[[Any], Any], items: Iterable[Any]) -> Dict[Any, Any]:
+    """
+    Call a function for several items (e.g. namespaces or object names) in parallel.
+
+    Each item is handled independently: a failure for one item is reported as
+    {"error": ...} for that item and does not affect the others.
+
+    Args:
+        func: Called as func(item); must not fan out on the same pool itself
+        items: The items; duplicates are handled once
+
+    Returns:
+        A dict mapping each item to its result
+    """
+    futures = {item: _executor.submit(func, item) for item in dict.fromkeys(items)}
+    results = {}
+    for item, future in futures.items():
+        try:
+            results[item] = future.result()
+        except Exception as e:
+            results[item] = {"error": str(e)}
+    return results
+
+
+def runs_in_thread(func: Callable) -> Callable:
+    """
+    Decorator that turns a blocking tool into a coroutine that runs it on a worker thread.
+
+    FastMCP calls synchronous tools directly on its event loop, so one slow API request
+    holds up every other tool call of the session. Wrapped tools are awaited instead,
+    and concurrent calls overlap their requests. The result is also encoded to MCP
+    content on the worker thread, with orjson. Apply it directly below @mcp.tool() of
+    every tool, so all tool results are encoded the same way.
+
+    Args:
+        func: The blocking tool function
+
+    Returns:
+        The decorated coroutine function
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(lambda: to_text_content(func(*args, **kwargs)))
+
+    return wrapper
@@ -1,11 +1,11 @@
 import argparse
 
-# Global readonly state
-_readonly_mode: bool = False
+# Readonly flag fixed by parse_arguments(); read directly on hot paths.
+READONLY: bool = False
 
 def parse_arguments() -> None:
     """Parse command line arguments and set global configuration."""
-    global _readonly_mode
+    global READONLY
     
     parser = argparse.ArgumentParser(description='K8s Pilot - Kubernetes management tool')
     parser.add_argument('--readonly', action='store_true', 
@@ -14,14 +14,5 @@ def parse_arguments() -> None:
     # Parse arguments from sys.argv
     args, unknown = parser.parse_known_args()
     
-    _readonly_mode = args.readonly
+    READONLY = args.readonly
 
-
-def is_readonly_mode() -> bool:
-    """Check if readonly mode is enabled."""
-    return _readonly_mode
-
-
-def get_readonly_mode() -> bool:
-    """Get the current readonly mode setting."""
-    return _readonly_mode 
\ No newline at end of file
@@ -1,8 +1,25 @@
-import inspect
 from functools import wraps
-from typing import Callable
+from typing import Callable, Dict, Tuple
 
-from kubernetes import config
+from core.kubeconfig import cached_on_kubeconfig
+
+
+@cached_on_kubeconfig
+def _resolve_defaults(config_data: dict) -> Tuple[str, Dict[str, str]]:
+    """
+    Extract the current context name and the default namespace of every context.
+
+    Args:
+        config_data: The parsed kubeconfig
+
+    Returns:
+        A tuple of (current context name, {context name: default namespace})
+    """
+    namespaces = {
+        ctx['name']: (ctx.get('context') or {}).get('namespace', 'default')
+        for ctx in config_data.get('contexts') or []
+    }
+    return config_data.get('current-context'), namespaces
 
 
 def get_current_context_name() -> str:
@@ -12,11 +29,8 @@ def get_current_context_name() -> str:
     Returns:
         The name of the current Kubernetes context
     """
-    # Load the kube config
-    _, active_context = config.list_kube_config_contexts()
-
-    # Return the name of the active context
-    return active_context['name']
+    current_context, _ = _resolve_defaults()
+    return current_context
 
 
 def get_default_namespace(context_name: str) -> str:
@@ -30,18 +44,10 @@ def get_default_namespace(context_name: str) -> str:
     Returns:
         The default namespace for the context
     """
-    # Load the kube config
-    contexts, _ = config.list_kube_config_contexts()
-
-    # Find the specified context
-    for ctx in contexts:
-        if ctx['name'] == context_name:
-            # Get the default namespace if set
-            context_data = ctx['context']
-            return context_data.get('namespace', 'default')
+    _, namespaces = _resolve_defaults()
 
     # If context not found or no namespace specified, return "default"
-    return 'default'
+    return namespaces.get(context_name, 'default')
 
 
 def use_current_context(func: Callable) -> Callable:
@@ -55,17 +61,23 @@ def use_current_context(func: Callable) -> Callable:
     Returns:
         The decorated function
     """
+    # The signature is static, so read the parameter names once at decoration time.
+    # Follow __wrapped__ to reach the original function below other decorators.
+    target = func
+    while hasattr(target, '__wrapped__'):
+        target = target.__wrapped__
+    code = target.__code__
+    params = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+    has_ctx = 'context_name' in params
+    has_ns = 'namespace' in params
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        sig = inspect.signature(func)
-        if 'context_name' in sig.parameters:
-            if 'context_name' not in kwargs or kwargs['context_name'] is None:
+        if has_ctx:
+            if kwargs.get('context_name') is None:
                 kwargs['context_name'] = get_current_context_name()
-            context_name = kwargs['context_name']
-            if 'namespace' in sig.parameters:
-                if 'namespace' not in kwargs or kwargs['namespace'] is None:
-                    kwargs['namespace'] = get_default_namespace(context_name)
+            if has_ns and kwargs.get('namespace') is None:
+                kwargs['namespace'] = get_default_namespace(kwargs['context_name'])
 
         return func(*args, **kwargs)
 
@@ -1,10 +1,71 @@
 import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import lru_cache, wraps
 
 import yaml
-from kubernetes import client, config
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.context import ContextInfo
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml is not available
+    from yaml import SafeLoader as _YamlLoader
+
+DEFAULT_KUBECONFIG_LOCATION = "~/.kube/config"
+
+# Maximum number of pooled connections kept alive per context. Sized for anyio's default
+# limit of 40 worker threads, which bounds the tool calls in flight (see runs_in_thread).
+CONNECTION_POOL_MAXSIZE = 40
+
+# (connect, read) timeout in seconds of a single API request. Without it a stalled API
+# server holds the worker thread of the tool forever.
+DEFAULT_REQUEST_TIMEOUT = (3.0, 30.0)
 
 _client_cache: Dict[str, Dict[str, any]] = {}
+_client_cache_lock = threading.Lock()
+
+# path -> ((st_mtime_ns, st_size), parsed kubeconfig)
+_kubeconfig_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+# How long a missing kubeconfig file is remembered before it is stat'ed again
+MISSING_KUBECONFIG_TTL = 2.0
+
+# path -> time.monotonic() deadline until which the file is assumed to be missing
+_missing_kubeconfigs: Dict[str, float] = {}
+
+# (parsed files it was built from, merged kubeconfig)
+_merged_kubeconfig: Tuple[List[dict], dict] = ([], {})
+
+# Top-level kubeconfig sections whose entries are merged by name
+_NAMED_SECTIONS = ("clusters", "contexts", "users")
+
+
+@lru_cache(maxsize=None)
+def _api_client_class():
+    """
+    Build the ApiClient subclass used for every context.
+    Response bodies are decoded with orjson before the client maps them onto its
+    model classes, which is noticeably faster than the stdlib json module on large lists.
+    :return: ApiClient subclass
+    """
+    import orjson
+    from kubernetes import client
+
+    class OrjsonApiClient(client.ApiClient):
+        def deserialize(self, response, response_type):
+            if response_type == "file":
+                return super().deserialize(response, response_type)
+            try:
+                data = orjson.loads(response.data)
+            except orjson.JSONDecodeError:
+                data = response.data
+            return self._ApiClient__deserialize(data, response_type)
+
+    return OrjsonApiClient
 
 
 def get_api_clients(context_name: str) -> Dict[str, any]:
@@ -12,32 +73,233 @@ def get_api_clients(context_name: str) -> Dict[str, any]:
     Get Kubernetes API clients for the specified context.
     This function caches the clients to avoid reloading the kubeconfig
     and reinitializing the clients multiple times.
+    All API groups share a single ApiClient, and therefore a single connection pool,
+    per context. The cache is guarded by a lock so concurrent tool calls load the
+    kubeconfig for a given context only once.
     :param context_name:
     :return:
     """
-    if context_name not in _client_cache:
-        configuration = client.Configuration()
-        config.load_kube_config(context=context_name, client_configuration=configuration)
-        api_client = client.ApiClient(configuration=configuration)
-        _client_cache[context_name] = {
-            "core": client.CoreV1Api(api_client),
-            "apps": client.AppsV1Api(api_client),
-            "batch": client.BatchV1Api(api_client),
-        }
-    return _client_cache[context_name]
+    clients = _client_cache.get(context_name)
+    if clients is not None:
+        return clients
+
+    # Imported lazily: loading the kubernetes package pulls in every generated model
+    # class, which would otherwise dominate server start-up time.
+    from kubernetes import client, config
+
+    with _client_cache_lock:
+        clients = _client_cache.get(context_name)
+        if clients is None:
+            configuration = client.Configuration()
+            config.load_kube_config(context=context_name, client_configuration=configuration)
+            configuration.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+            api_client = _api_client_class()(configuration=configuration)
+            # The API server gzips large responses (mostly lists) when asked to; urllib3
+            # decompresses them transparently when the body is read
+            api_client.set_default_header("Accept-Encoding", "gzip")
+            clients = {
+                "api_client": api_client,
+                "core": client.CoreV1Api(api_client),
+                "apps": client.AppsV1Api(api_client),
+                "batch": client.BatchV1Api(api_client),
+                "networking": client.NetworkingV1Api(api_client),
+                "rbac": client.RbacAuthorizationV1Api(api_client),
+                "storage": client.StorageV1Api(api_client),
+                "custom": client.CustomObjectsApi(api_client),
+            }
+            _client_cache[context_name] = clients
+    return clients
+
+
+def request_timeout(read_timeout: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Build the _request_timeout argument of a Kubernetes API call.
+
+    Args:
+        read_timeout: The read timeout in seconds, or None for the default one
+
+    Returns:
+        A (connect, read) timeout tuple
+    """
+    connect_timeout, default_read_timeout = DEFAULT_REQUEST_TIMEOUT
+    return connect_timeout, read_timeout or default_read_timeout
+
+
+def get_kubeconfig_paths() -> List[str]:
+    """
+    Resolve the kubeconfig files to load.
+    The default location is usually ~/.kube/config. The KUBECONFIG environment variable
+    may hold several paths separated by os.pathsep, like kubectl supports.
+    """
+    return list(_resolve_kubeconfig_paths(os.environ.get("KUBECONFIG") or DEFAULT_KUBECONFIG_LOCATION))
+
+
+@lru_cache(maxsize=8)
+def _resolve_kubeconfig_paths(value: str) -> Tuple[str, ...]:
+    # Cached per $KUBECONFIG value, so expanduser() only runs when the variable changes
+    return tuple(os.path.expanduser(path) for path in value.split(os.pathsep) if path)
+
+
+def load_kubeconfig_file(kubeconfig_path: str) -> dict:
+    """
+    Load a single kubeconfig file.
+    The parsed data is cached and only re-read when the file's mtime or size changes,
+    so callers must treat the returned dict as read-only.
+    If the file does not exist or is not readable, it raises an exception. A missing file
+    is remembered for MISSING_KUBECONFIG_TTL seconds so repeated lookups skip the stat call.
+    """
+    missing_until = _missing_kubeconfigs.get(kubeconfig_path)
+    if missing_until is not None and time.monotonic() < missing_until:
+        raise FileNotFoundError(f"Kubeconfig file not found: {kubeconfig_path}")
+
+    try:
+        stat = os.stat(kubeconfig_path)
+    except FileNotFoundError:
+        _missing_kubeconfigs[kubeconfig_path] = time.monotonic() + MISSING_KUBECONFIG_TTL
+        _kubeconfig_cache.pop(kubeconfig_path, None)
+        raise
+    _missing_kubeconfigs.pop(kubeconfig_path, None)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _kubeconfig_cache.get(kubeconfig_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(kubeconfig_path, "r") as f:
+        config_data = yaml.load(f, Loader=_YamlLoader) or {}
+    _kubeconfig_cache[kubeconfig_path] = (stamp, config_data)
+    return config_data
+
+
+def _merge_kubeconfigs(configs: List[dict]) -> dict:
+    """
+    Merge kubeconfig files following kubectl precedence rules:
+    the first file to define a context, cluster, user or top-level key wins.
+    """
+    merged: Dict[str, any] = {}
+    for config_data in configs:
+        for key, value in config_data.items():
+            if key in _NAMED_SECTIONS:
+                section = merged.setdefault(key, [])
+                seen = {entry["name"] for entry in section}
+                section.extend(entry for entry in value or [] if entry["name"] not in seen)
+            elif merged.get(key) is None:
+                merged[key] = value
+    return merged
 
 
 def get_kubeconfig():
     """
-    Load the kubeconfig file from the default location.
+    Load the kubeconfig from the default location.
     The default location is usually ~/.kube/config.
     This function returns the parsed kubeconfig data.
     If the file does not exist or is not readable, it raises an exception.
 
     if you want to load a different kubeconfig file, you can set the KUBECONFIG environment variable
-    to the path of the kubeconfig file you want to use.
+    to the path of the kubeconfig file you want to use. Several files separated by os.pathsep
+    are merged in-process, and files that do not exist are skipped.
+
+    Each file is cached independently and the same merged dict is returned until one of them
+    changes, so callers must treat the returned dict as read-only.
     """
-    kubeconfig_path = os.path.expanduser(config.KUBE_CONFIG_DEFAULT_LOCATION)
-    with open(kubeconfig_path, "r") as f:
-        config_data = yaml.safe_load(f)
-    return config_data
+    global _merged_kubeconfig
+
+    sources = []
+    for kubeconfig_path in get_kubeconfig_paths():
+        try:
+            sources.append(load_kubeconfig_file(kubeconfig_path))
+        except FileNotFoundError:
+            continue
+
+    if not sources:
+        raise FileNotFoundError(f"No kubeconfig file found in {os.pathsep.join(get_kubeconfig_paths())}")
+    if len(sources) == 1:
+        return sources[0]
+
+    cached_sources, merged = _merged_kubeconfig
+    if len(cached_sources) != len(sources) or any(a is not b for a, b in zip(cached_sources, sources)):
+        merged = _merge_kubeconfigs(sources)
+        _merged_kubeconfig = (sources, merged)
+    return merged
+
+
+def write_kubeconfig(kubeconfig_path: str, content: bytes) -> None:
+    """
+    Atomically replace the contents of a kubeconfig file.
+    The content is written to a temporary file in the same directory and renamed over
+    the original, so readers never observe a partially written kubeconfig. Symlinks are
+    followed and the original file mode is preserved.
+    :param kubeconfig_path: The kubeconfig file to replace
+    :param content: The new raw file content
+    """
+    target = os.path.realpath(kubeconfig_path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".kubeconfig-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(target, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    finally:
+        _kubeconfig_cache.pop(kubeconfig_path, None)
+        _missing_kubeconfigs.pop(kubeconfig_path, None)
+
+
+def cached_on_kubeconfig(func: Callable[[dict], any]) -> Callable[[], any]:
+    """
+    Decorator that memoizes a function of the parsed kubeconfig.
+
+    The decorated function receives the kubeconfig data and is only re-evaluated
+    when get_kubeconfig() re-parses the file, i.e. when its mtime or size changes.
+    """
+    cache: Dict[str, any] = {}
+
+    @wraps(func)
+    def wrapper():
+        config_data = get_kubeconfig()
+        if cache.get("source") is not config_data:
+            cache["value"] = func(config_data)
+            cache["source"] = config_data
+        return cache["value"]
+
+    return wrapper
+
+
+def _project_context(name: str, context_data: dict, current_context: Optional[str]) -> ContextInfo:
+    # context_data is looked up once per context rather than once per field
+    get = context_data.get
+    return ContextInfo(name=name, cluster=get("cluster"), user=get("user"), current=name == current_context)
+
+
+@cached_on_kubeconfig
+def _contexts_projection(config_data: dict) -> Tuple[List[ContextInfo], Dict[str, ContextInfo]]:
+    current_context = config_data.get("current-context")
+    contexts = [
+        _project_context(ctx["name"], ctx.get("context") or {}, current_context)
+        for ctx in config_data.get("contexts") or []]
+    return contexts, {ctx.name: ctx for ctx in contexts}
+
+
+def get_contexts_projection() -> List[ContextInfo]:
+    """
+    Get all contexts from the kubeconfig file.
+    The projection is built once per kubeconfig change, so repeated calls
+    do not touch the YAML data at all.
+    :return: A new list of ContextInfo for every context in the kubeconfig
+    """
+    contexts, _ = _contexts_projection()
+    return list(contexts)
+
+
+def get_context_info(context_name: Optional[str]) -> Optional[ContextInfo]:
+    """
+    Look up a single context from the kubeconfig file by name.
+    :param context_name: The context name
+    :return: The matching ContextInfo, or None if the context does not exist
+    """
+    _, contexts_by_name = _contexts_projection()
+    return contexts_by_name.get(context_name)
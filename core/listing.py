@@ -0,0 +1,174 @@
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+# Number of items requested per page from the API server
+LIST_PAGE_SIZE = 500
+
+# Ask the API server for PartialObjectMetadataList (metadata only, no spec/status).
+# Servers that do not support it fall back to the regular JSON list.
+PARTIAL_METADATA_LIST_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json"
+
+_name_of = itemgetter("name")
+
+
+def selector_query(label_selector: Optional[str] = None, field_selector: Optional[str] = None) -> Dict[str, str]:
+    """
+    Build the query parameters of the given label and field selectors.
+
+    Args:
+        label_selector: Optional label selector, e.g. "app=nginx"
+        field_selector: Optional field selector, e.g. "metadata.name=nginx"
+
+    Returns:
+        A dict with the labelSelector and fieldSelector query parameters that are set
+    """
+    selectors = {"labelSelector": label_selector, "fieldSelector": field_selector}
+    return {k: v for k, v in selectors.items() if v}
+
+
+def iter_raw_items(list_func: Callable, *args, **kwargs) -> Iterator[dict]:
+    """
+    Iterate over the items of a Kubernetes list call without building client models.
+
+    The collection is fetched page by page with limit/continue, and every page is decoded
+    straight from the raw response bytes, so items are plain dicts in API (camelCase) form.
+
+    Args:
+        list_func: A list_* method of a Kubernetes API client
+        *args: Positional arguments passed to list_func, e.g. the namespace
+        **kwargs: Keyword arguments passed to list_func, e.g. label_selector
+
+    Returns:
+        An iterator over the raw items of the collection
+    """
+    kwargs.setdefault("limit", LIST_PAGE_SIZE)
+    token = None
+    while True:
+        response = list_func(*args, _continue=token, _preload_content=False, **kwargs)
+        try:
+            page = orjson.loads(response.data)
+        finally:
+            response.release_conn()
+
+        yield from page.get("items") or []
+
+        token = (page.get("metadata") or {}).get("continue")
+        if not token:
+            return
+
+
+def read_raw_object(read_func: Callable, *args, **kwargs) -> dict:
+    """
+    Read a single Kubernetes object without building client models.
+
+    Args:
+        read_func: A read_* method of a Kubernetes API client
+        *args: Positional arguments passed to read_func
+        **kwargs: Keyword arguments passed to read_func, e.g. name and namespace
+
+    Returns:
+        The raw object as a plain dict in API (camelCase) form
+    """
+    response = read_func(*args, _preload_content=False, **kwargs)
+    try:
+        return orjson.loads(response.data)
+    finally:
+        response.release_conn()
+
+
+def iter_object_metadata(api_client, path: str, request_timeout=None, **query) -> Iterator[dict]:
+    """
+    Iterate over the metadata of every object in a Kubernetes collection.
+
+    Only object metadata is requested from the API server, so spec and status never
+    cross the wire. Pages are fetched with limit/continue and decoded from the raw bytes.
+
+    Args:
+        api_client: The kubernetes ApiClient of the context
+        path: The collection path, e.g. "/api/v1/nodes"
+        request_timeout: The _request_timeout of every page request
+        **query: Extra query parameters, e.g. labelSelector
+
+    Returns:
+        An iterator over the raw metadata dicts of the collection
+    """
+    query.setdefault("limit", LIST_PAGE_SIZE)
+    token = None
+    while True:
+        query_params = list(query.items())
+        if token:
+            query_params.append(("continue", token))
+        response = api_client.call_api(
+            path, "GET",
+            query_params=query_params,
+            header_params={"Accept": PARTIAL_METADATA_LIST_ACCEPT},
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _preload_content=False,
+            _request_timeout=request_timeout,
+        )
+        try:
+            page = orjson.loads(response.data)
+        finally:
+            response.release_conn()
+
+        for item in page.get("items") or []:
+            yield item["metadata"]
+
+        token = (page.get("metadata") or {}).get("continue")
+        if not token:
+            return
+
+
+def list_page(api_client, path: str, limit: int, continue_token: Optional[str] = None,
+              metadata_only: bool = False, request_timeout=None, **query) -> Tuple[List[dict], Optional[str]]:
+    """
+    Fetch a single page of a Kubernetes collection, for tools that expose pagination.
+
+    Args:
+        api_client: The kubernetes ApiClient of the context
+        path: The collection path, e.g. "/api/v1/namespaces/default/secrets"
+        limit: The maximum number of items in the page
+        continue_token: The continue token returned with the previous page
+        metadata_only: Whether to request only object metadata (items keep their "metadata" key)
+        request_timeout: The _request_timeout of the request
+        **query: Extra query parameters, e.g. labelSelector
+
+    Returns:
+        A tuple of (raw items, continue token or None on the last page)
+    """
+    query_params = [("limit", limit), *query.items()]
+    if continue_token:
+        query_params.append(("continue", continue_token))
+    response = api_client.call_api(
+        path, "GET",
+        query_params=query_params,
+        header_params={"Accept": PARTIAL_METADATA_LIST_ACCEPT if metadata_only else "application/json"},
+        auth_settings=["BearerToken"],
+        _return_http_data_only=True,
+        _preload_content=False,
+        _request_timeout=request_timeout,
+    )
+    try:
+        page = orjson.loads(response.data)
+    finally:
+        response.release_conn()
+    return page.get("items") or [], (page.get("metadata") or {}).get("continue") or None
+
+
+def list_object_names(api_client, path: str, request_timeout=None, **query) -> List[Dict[str, str]]:
+    """
+    List the names of every object in a Kubernetes collection as [{"name": ...}, ...].
+
+    Args:
+        api_client: The kubernetes ApiClient of the context
+        path: The collection path, e.g. "/api/v1/nodes"
+        request_timeout: The _request_timeout of every page request
+        **query: Extra query parameters, e.g. labelSelector
+
+    Returns:
+        A list of {"name": name} dicts, in the order returned by the API server
+    """
+    return [{"name": name} for name in map(_name_of, iter_object_metadata(api_client, path, request_timeout, **query))]
@@ -1,6 +1,9 @@
 import functools
+import re
 from typing import Callable, Any
-from core.config import is_readonly_mode
+from core import config
+
+_WRITE_OPERATION_RE = re.compile(r"create|update|delete|patch|replace", re.IGNORECASE)
 
 
 def check_readonly_permission(func: Callable) -> Callable:
@@ -10,10 +13,11 @@ def check_readonly_permission(func: Callable) -> Callable:
     This decorator should be applied to all write operations (create, update, delete).
     In readonly mode, these operations will raise a PermissionError.
     """
+    operation_name = func.__name__
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
-        if is_readonly_mode():
-            operation_name = func.__name__
+        if config.READONLY:
             raise PermissionError(
                 f"Operation '{operation_name}' is not allowed in readonly mode. "
                 f"Only read/get operations are permitted when --readonly flag is used."
@@ -32,5 +36,4 @@ def is_write_operation(func_name: str) -> bool:
     Returns:
         True if the function is a write operation, False otherwise
     """
-    write_operations = ['create', 'update', 'delete', 'patch', 'replace']
-    return any(op in func_name.lower() for op in write_operations) 
\ No newline at end of file
+    return _WRITE_OPERATION_RE.search(func_name) is not None 
\ No newline at end of file
@@ -0,0 +1,105 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from core.kubeconfig import get_api_clients, request_timeout
+
+# Maximum number of remembered resourceVersions before the table is reset
+MAX_TRACKED_OBJECTS = 4096
+
+# (context name, API path) -> last resourceVersion returned for it
+_last_resource_versions: Dict[Tuple[str, str], str] = {}
+_lock = threading.Lock()
+
+
+def last_resource_version(context_name: str, path: str) -> Optional[str]:
+    """
+    Get the last resourceVersion seen for an object or collection.
+
+    Args:
+        context_name: The Kubernetes context name
+        path: The API path of the object or collection
+
+    Returns:
+        The resourceVersion, or None if nothing was recorded yet
+    """
+    return _last_resource_versions.get((context_name, path))
+
+
+def remember_resource_version(context_name: str, path: str, resource_version: Optional[str]) -> None:
+    """
+    Record the resourceVersion returned for an object or collection.
+
+    Args:
+        context_name: The Kubernetes context name
+        path: The API path of the object or collection
+        resource_version: The resourceVersion from the response metadata
+    """
+    if not resource_version:
+        return
+    with _lock:
+        if len(_last_resource_versions) >= MAX_TRACKED_OBJECTS:
+            _last_resource_versions.clear()
+        _last_resource_versions[(context_name, path)] = resource_version
+
+
+def forget_resource_versions(context_name: str) -> None:
+    """
+    Drop every resourceVersion recorded for a context.
+
+    Called after writes: the next read of an object is a regular (quorum) read, so it
+    reflects the write instead of a watch cache that may not have caught up yet.
+
+    Args:
+        context_name: The Kubernetes context name
+    """
+    with _lock:
+        for key in [key for key in _last_resource_versions if key[0] == context_name]:
+            del _last_resource_versions[key]
+
+
+def read_not_older_than(context_name: str, path: str, response_type: str):
+    """
+    Read a single object, allowing the API server to answer from its watch cache.
+
+    The first read of an object is a regular (quorum) read. Later reads pass the last
+    resourceVersion seen, which asks for data that is not older than that version, so
+    the API server can serve it from its watch cache instead of reading from etcd.
+    Reads never go back in time.
+
+    Args:
+        context_name: The Kubernetes context name
+        path: The object path, e.g. "/api/v1/nodes/node-1"
+        response_type: The client model to deserialize into, e.g. "V1Node"
+
+    Returns:
+        The deserialized object
+    """
+    from kubernetes.client.rest import ApiException
+
+    api_client = get_api_clients(context_name)["api_client"]
+    resource_version = last_resource_version(context_name, path)
+
+    def read(query_params):
+        return api_client.call_api(
+            path, "GET",
+            query_params=query_params,
+            header_params={"Accept": "application/json"},
+            response_type=response_type,
+            auth_settings=["BearerToken"],
+            _return_http_data_only=True,
+            _request_timeout=request_timeout(),
+        )
+
+    if resource_version is None:
+        obj = read([])
+    else:
+        try:
+            obj = read([("resourceVersion", resource_version)])
+        except ApiException as e:
+            # 504: the watch cache has not caught up (e.g. after an API server restart)
+            if e.status not in (410, 504):
+                raise
+            obj = read([])
+
+    remember_resource_version(context_name, path, obj.metadata.resource_version)
+    return obj
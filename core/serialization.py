@@ -0,0 +1,31 @@
+from typing import Any, List
+
+import orjson
+from mcp.types import TextContent
+
+# datetimes are emitted as RFC 3339 with a "Z" suffix, matching Kubernetes timestamps
+_DUMPS_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+def to_text_content(result: Any) -> List[TextContent]:
+    """
+    Encode a tool result into MCP text content with orjson.
+
+    Produces the same content items as FastMCP's own conversion (None gives no item,
+    every list element becomes its own item, strings are passed through), but encodes
+    with orjson instead of pydantic's to_jsonable_python followed by json.dumps.
+    Values orjson cannot encode natively, e.g. client models, fall back to str().
+
+    Args:
+        result: The value returned by a tool
+
+    Returns:
+        The text content items
+    """
+    if result is None:
+        return []
+    if isinstance(result, (list, tuple)):
+        return [content for item in result for content in to_text_content(item)]
+    if not isinstance(result, str):
+        result = orjson.dumps(result, default=str, option=_DUMPS_OPTIONS).decode()
+    return [TextContent(type="text", text=result)]
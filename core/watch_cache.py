@@ -0,0 +1,391 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from core.kubeconfig import DEFAULT_REQUEST_TIMEOUT, get_api_clients
+from core.listing import LIST_PAGE_SIZE, PARTIAL_METADATA_LIST_ACCEPT
+
+# Seconds a collection watch keeps running after the collection was last read
+WATCH_CACHE_IDLE_TIMEOUT = 600.0
+
+# Server-side timeout of a single watch request. The watch is re-established afterwards,
+# which is also when an idle watch notices that it should stop.
+WATCH_TIMEOUT_SECONDS = 60
+
+# Seconds to wait before listing again after the list or watch failed
+WATCH_RETRY_DELAY = 5.0
+
+# Upper bound of the retry delay, which doubles with every consecutive 401/403 answer
+WATCH_MAX_RETRY_DELAY = 300.0
+
+# Maximum number of collections watched at once (each one holds a thread and a watch
+# connection); the least recently read collection stops being watched beyond that
+WATCH_CACHE_MAX_INFORMERS = 32
+
+# Annotation key prefixes dropped from objects: the last applied configuration duplicates
+# the whole object, and the control-plane ones are bulky bookkeeping of controllers
+_STRIPPED_ANNOTATION_PREFIXES = (
+    "kubectl.kubernetes.io/last-applied-configuration",
+    "control-plane.alpha.kubernetes.io/",
+)
+
+# Accept header of metadata-only watches; the events carry single objects, not lists. There is
+# no plain JSON fallback, so a metadata-only watch never streams whole objects.
+_PARTIAL_METADATA_WATCH_ACCEPT = "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1"
+
+# (context name, collection path, transform, metadata only) -> informer, least recently read first
+_informers: "OrderedDict[Tuple[str, str, Callable[[dict], dict], bool], _Informer]" = OrderedDict()
+_informers_lock = threading.Lock()
+
+
+class _ResourceExpired(Exception):
+    """The watch resourceVersion is too old and the collection has to be listed again."""
+
+
+def _version(resource_version: Optional[str]) -> Optional[int]:
+    # resourceVersions are opaque strings, but every API server backed by etcd uses its revision
+    try:
+        return int(resource_version)
+    except (TypeError, ValueError):
+        return None
+
+
+def visible_annotations(annotations: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Drop the annotations that only bloat tool responses (e.g. last-applied-configuration).
+
+    Args:
+        annotations: The object annotations, possibly None
+
+    Returns:
+        A new dict with the remaining annotations
+    """
+    return {k: v for k, v in (annotations or {}).items() if not k.startswith(_STRIPPED_ANNOTATION_PREFIXES)}
+
+
+def strip_object(obj: dict) -> dict:
+    """
+    Remove managedFields and the annotations filtered by visible_annotations() in place.
+
+    Args:
+        obj: A raw Kubernetes object
+
+    Returns:
+        The same object
+    """
+    metadata = obj.get("metadata") or {}
+    metadata.pop("managedFields", None)
+    if metadata.get("annotations"):
+        metadata["annotations"] = visible_annotations(metadata["annotations"])
+    return obj
+
+
+class _Informer:
+    """
+    Keeps the objects of one collection in memory: lists them once, then follows a watch
+    stream and applies ADDED/MODIFIED/DELETED events to the local copy.
+    """
+
+    def __init__(self, context_name: str, path: str, transform: Callable[[dict], dict], metadata_only: bool):
+        self.context_name = context_name
+        self.path = path
+        self.key = (context_name, path, transform, metadata_only)
+        self.synced = threading.Event()
+        self.last_access = time.monotonic()
+        self._transform = transform
+        self._metadata_only = metadata_only
+        self._objects: Dict[str, dict] = {}
+        self._resource_version: Optional[str] = None
+        # Reads bypass the cache until the watch has reached this version (set after writes)
+        self._min_version: Optional[int] = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name=f"k8s-pilot-watch-{context_name}-{path}", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        # Takes effect at the latest when the running watch request times out
+        self._stopped.set()
+
+    def current(self) -> bool:
+        """Whether the cache is synced and has caught up with the writes awaited by await_write()."""
+        if not self.synced.is_set():
+            return False
+        with self._lock:
+            if self._min_version is None:
+                return True
+            seen = _version(self._resource_version)
+            if seen is None or seen < self._min_version:
+                return False
+            self._min_version = None
+            return True
+
+    def await_version(self, resource_version: Optional[str]) -> bool:
+        """
+        Bypass the cache until the watch has seen resource_version.
+
+        Returns:
+            False if the versions cannot be ordered, in which case the informer has to be replaced
+        """
+        version = _version(resource_version)
+        if version is None:
+            return False
+        with self._lock:
+            self._min_version = max(self._min_version or 0, version)
+        return True
+
+    def objects(self) -> List[dict]:
+        self.last_access = time.monotonic()
+        with self._lock:
+            return [self._objects[name] for name in sorted(self._objects)]
+
+    def get(self, name: str) -> Optional[dict]:
+        self.last_access = time.monotonic()
+        return self._objects.get(name)
+
+    def _idle(self) -> bool:
+        return time.monotonic() - self.last_access > WATCH_CACHE_IDLE_TIMEOUT
+
+    def _request(self, query_params: list, request_timeout=DEFAULT_REQUEST_TIMEOUT, watch: bool = False):
+        from kubernetes.client.rest import ApiException
+
+        api_client = get_api_clients(self.context_name)["api_client"]
+        accept = "application/json"
+        if self._metadata_only:
+            accept = _PARTIAL_METADATA_WATCH_ACCEPT if watch else PARTIAL_METADATA_LIST_ACCEPT
+        try:
+            return api_client.call_api(
+                self.path, "GET",
+                query_params=query_params,
+                header_params={"Accept": accept},
+                auth_settings=["BearerToken"],
+                _return_http_data_only=True,
+                _preload_content=False,
+                _request_timeout=request_timeout,
+            )
+        except ApiException as e:
+            # An expired resourceVersion or continue token may also be rejected up front
+            if e.status == 410:
+                raise _ResourceExpired() from e
+            raise
+
+    def _list(self) -> None:
+        objects = {}
+        resource_version = None
+        token = None
+        while True:
+            query_params = [("limit", LIST_PAGE_SIZE)]
+            if token:
+                query_params.append(("continue", token))
+            response = self._request(query_params)
+            try:
+                page = orjson.loads(response.data)
+            finally:
+                response.release_conn()
+
+            for obj in page.get("items") or []:
+                objects[obj["metadata"]["name"]] = self._transform(obj)
+
+            list_metadata = page.get("metadata") or {}
+            # Every page of a paginated list is served from the snapshot of the first one
+            resource_version = resource_version or list_metadata.get("resourceVersion")
+            token = list_metadata.get("continue")
+            if not token:
+                break
+
+        with self._lock:
+            self._objects = objects
+            self._resource_version = resource_version
+
+    def _watch(self) -> None:
+        from kubernetes.watch.watch import iter_resp_lines
+
+        response = self._request(
+            [
+                ("watch", "true"),
+                ("resourceVersion", self._resource_version),
+                ("allowWatchBookmarks", "true"),
+                ("timeoutSeconds", WATCH_TIMEOUT_SECONDS),
+            ],
+            # Give up on a connection that stays silent well past the server-side timeout
+            request_timeout=(None, WATCH_TIMEOUT_SECONDS + 30),
+            watch=True,
+        )
+        try:
+            for line in iter_resp_lines(response):
+                if self._stopped.is_set():
+                    break
+                event = orjson.loads(line)
+                event_type = event["type"]
+                obj = event["object"]
+                if event_type == "ERROR":
+                    if obj.get("code") == 410:
+                        raise _ResourceExpired()
+                    raise RuntimeError(f"watch failed: {obj.get('message')}")
+
+                # Bookmarks only carry the latest resourceVersion, so a watch of a quiet
+                # collection can still resume after a disconnect instead of listing again
+                with self._lock:
+                    if event_type != "BOOKMARK":
+                        name = obj["metadata"]["name"]
+                        if event_type == "DELETED":
+                            self._objects.pop(name, None)
+                        else:
+                            self._objects[name] = self._transform(obj)
+                    self._resource_version = obj["metadata"].get("resourceVersion") or self._resource_version
+
+                # After a reconnect the watch first replays the changes missed since the
+                # last resourceVersion seen; the cache is served again once they start
+                # arriving, not as soon as the request is accepted
+                if not self.synced.is_set():
+                    self.synced.set()
+        finally:
+            response.release_conn()
+
+    def _run(self) -> None:
+        auth_failures = 0
+        while not (self._idle() or self._stopped.is_set()):
+            try:
+                if self._resource_version is None:
+                    self._list()
+                    self.synced.set()
+                self._watch()
+                auth_failures = 0
+            except _ResourceExpired:
+                self._resource_version = None
+            except Exception as e:
+                # Reads fall back to live requests until the watch is re-established. It
+                # resumes from the last resourceVersion seen; the collection is only
+                # listed again if that version has expired (or the list itself failed).
+                self.synced.clear()
+                if getattr(e, "status", None) in (401, 403):
+                    # Credentials or RBAC rules are not fixed within seconds, so back off
+                    auth_failures += 1
+                    self._stopped.wait(min(WATCH_RETRY_DELAY * 2 ** auth_failures, WATCH_MAX_RETRY_DELAY))
+                else:
+                    self._stopped.wait(WATCH_RETRY_DELAY)
+
+        _forget(self)
+
+
+def _forget(informer: _Informer) -> None:
+    with _informers_lock:
+        if _informers.get(informer.key) is informer:
+            del _informers[informer.key]
+
+
+def _synced_informer(context_name: str, path: str, transform: Callable[[dict], dict], metadata_only: bool,
+                     start: bool = True) -> Optional[_Informer]:
+    """
+    Get the informer of a collection, starting it on first use if start is set.
+
+    Returns:
+        The informer, or None if it does not exist or has not caught up yet
+    """
+    # Keyed on the transform too, so every caller gets the projection it asked for
+    key = (context_name, path, transform, metadata_only)
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None:
+            if not start:
+                return None
+            informer = _informers[key] = _Informer(context_name, path, transform, metadata_only)
+            informer.start()
+            while len(_informers) > WATCH_CACHE_MAX_INFORMERS:
+                _informers.popitem(last=False)[1].stop()
+        else:
+            _informers.move_to_end(key)
+
+    informer.last_access = time.monotonic()
+    return informer if informer.current() else None
+
+
+def cached_objects(context_name: str, path: str, transform: Callable[[dict], dict] = strip_object,
+                   metadata_only: bool = False) -> Optional[List[dict]]:
+    """
+    Get every object of a collection from the local watch cache.
+
+    The first call for a collection starts a background list and watch and returns None,
+    so the caller answers that request with a live read. The watch stops by itself once
+    the collection has not been read for WATCH_CACHE_IDLE_TIMEOUT seconds, or when more
+    than WATCH_CACHE_MAX_INFORMERS collections are watched. Cached objects must not be
+    mutated.
+
+    Args:
+        context_name: The Kubernetes context name
+        path: The collection path, e.g. "/api/v1/namespaces/default/pods"
+        transform: Applied to every object before it is cached. Callers passing different
+            transforms for the same collection get separate caches.
+        metadata_only: Watch PartialObjectMetadata, so only "metadata" is cached
+
+    Returns:
+        The raw objects sorted by name, or None if the cache is not available
+    """
+    informer = _synced_informer(context_name, path, transform, metadata_only)
+    if informer is None:
+        return None
+    return informer.objects()
+
+
+def cached_object(context_name: str, path: str, name: str, transform: Callable[[dict], dict] = strip_object,
+                  metadata_only: bool = False) -> Optional[dict]:
+    """
+    Get a single object from the local watch cache of its collection.
+
+    Single reads never start a watch; they are only served once the collection is
+    already watched because it has been listed.
+
+    Args:
+        context_name: The Kubernetes context name
+        path: The collection path, e.g. "/api/v1/namespaces/default/pods"
+        name: The object name
+        transform: See cached_objects()
+        metadata_only: See cached_objects()
+
+    Returns:
+        The raw object, or None if it is not cached (or the cache is not available)
+    """
+    informer = _synced_informer(context_name, path, transform, metadata_only, start=False)
+    if informer is None:
+        return None
+    return informer.get(name)
+
+
+def await_write(context_name: str, path: str, resource_version: Optional[str] = None) -> None:
+    """
+    Bypass the watch caches of a collection until they have seen a write to it, so reads
+    right after a create, update or delete do not return the state from before it.
+
+    Args:
+        context_name: The Kubernetes context name
+        path: The collection path, e.g. "/api/v1/namespaces/default/pods"
+        resource_version: The resourceVersion returned by the write. Without it (e.g. after
+            a delete), the current resourceVersion of the collection is read instead.
+    """
+    with _informers_lock:
+        informers = [informer for key, informer in _informers.items() if key[:2] == (context_name, path)]
+    if not informers:
+        return
+
+    if resource_version is None:
+        try:
+            response = informers[0]._request([("limit", 1)])
+            try:
+                resource_version = (orjson.loads(response.data).get("metadata") or {}).get("resourceVersion")
+            finally:
+                response.release_conn()
+        except Exception:
+            resource_version = None
+
+    for informer in informers:
+        if not informer.await_version(resource_version):
+            # Without an ordered version to wait for, start over with a fresh list
+            informer.stop()
+            _forget(informer)
@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContextInfo:
     """
     Represents a Kubernetes context.
+    Instances are shared by the kubeconfig cache, so they are immutable.
     """
     name: str
     cluster: str
@@ -1,27 +1,37 @@
+import importlib
+
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("k8s-pilot")
 
+# Modules whose @mcp.tool/@mcp.resource decorators register with the server.
+# Kubernetes client/model imports inside them are deferred to call time, so
+# importing these only records tool metadata.
+TOOL_MODULES = (
+    "resources.contexts",
+    "tools.cluster",
+    "tools.configmap",
+    "tools.daemonset",
+    "tools.deployment",
+    "tools.ingress",
+    "tools.namespace",
+    "tools.node",
+    "tools.pod",
+    "tools.pv",
+    "tools.pvc",
+    "tools.replicaset",
+    "tools.role",
+    "tools.secret",
+    "tools.service",
+    "tools.serviceaccount",
+    "tools.statefulset",
+)
+
 
 # Tool/resource registration (required to trigger @mcp.tool/@mcp.resource)
 def load_modules():
-    import resources.contexts  # noqa: F401
-    import tools.cluster  # noqa: F401
-    import tools.configmap  # noqa: F401
-    import tools.daemonset  # noqa: F401
-    import tools.deployment  # noqa: F401
-    import tools.ingress  # noqa: F401
-    import tools.namespace  # noqa: F401
-    import tools.node  # noqa: F401
-    import tools.pod  # noqa: F401
-    import tools.pv  # noqa: F401
-    import tools.pvc  # noqa: F401
-    import tools.replicaset  # noqa: F401
-    import tools.role  # noqa: F401
-    import tools.secret  # noqa: F401
-    import tools.service  # noqa: F401
-    import tools.serviceaccount  # noqa: F401
-    import tools.statefulset  # noqa: F401
+    for name in TOOL_MODULES:
+        importlib.import_module(name)
 
 
 load_modules()
@@ -1,68 +1,64 @@
+import json
 import os
+import re
 
 import yaml
 
-from core.kubeconfig import get_kubeconfig
-from models.context import ContextInfo
+from core.concurrency import runs_in_thread
+from core.context import get_current_context_name
+from core.kubeconfig import get_context_info, get_contexts_projection, get_kubeconfig_paths, load_kubeconfig_file, \
+    write_kubeconfig
 from server.server import mcp
 
+_CURRENT_CONTEXT_RE = re.compile(rb"^current-context:[^\r\n]*", re.M)
+
 
 @mcp.tool()
+@runs_in_thread
 def get_clusters():
     """
     Get all clusters from the kubeconfig file.
     :return:
     """
-    config_data = get_kubeconfig()
-    current_context = config_data.get("current-context")
-    contexts = config_data.get("contexts", [])
-
-    return [
-        ContextInfo(
-            name=ctx["name"],
-            cluster=ctx["context"].get("cluster"),
-            user=ctx["context"].get("user"),
-            current=ctx["name"] == current_context,
-        )
-        for ctx in contexts]
+    return get_contexts_projection()
 
 
 @mcp.tool()
+@runs_in_thread
 def get_current_cluster():
     """
     Get the current cluster from the kubeconfig file.
     :return:
     """
-    config_data = get_kubeconfig()
-    current_context = config_data.get("current-context")
-    contexts = config_data.get("contexts", [])
-
-    for ctx in contexts:
-        if ctx["name"] == current_context:
-            return ContextInfo(
-                name=ctx["name"],
-                cluster=ctx["context"].get("cluster"),
-                user=ctx["context"].get("user"),
-                current=True,
-            )
-    return None
+    return get_context_info(get_current_context_name())
 
 
 @mcp.tool()
+@runs_in_thread
 def set_current_cluster(cluster_name: str):
     """
     Set the current cluster in the kubeconfig file.
     :param cluster_name:
     :return:
     """
-    config_data = get_kubeconfig()
-    contexts = config_data.get("contexts", [])
+    if get_context_info(cluster_name) is None:
+        return {"status": "error", "message": f"Context {cluster_name} not found"}
 
-    for ctx in contexts:
-        if ctx["name"] == cluster_name:
-            config_data["current-context"] = cluster_name
-            with open(os.path.expanduser("~/.kube/config"), "w") as f:
-                yaml.dump(config_data, f)
+    # Only the current-context line changes, so patch it in place to keep the rest of
+    # the file (comments, ordering, formatting) untouched. Like kubectl, write it to the
+    # first kubeconfig file that already sets current-context.
+    line = b"current-context: " + json.dumps(cluster_name).encode()
+    kubeconfig_paths = [path for path in get_kubeconfig_paths() if os.path.exists(path)]
+    for kubeconfig_path in kubeconfig_paths:
+        with open(kubeconfig_path, "rb") as f:
+            raw = f.read()
+        content, replaced = _CURRENT_CONTEXT_RE.subn(lambda _: line, raw, count=1)
+        if replaced:
+            write_kubeconfig(kubeconfig_path, content)
             return {"status": "success", "message": f"Current context set to {cluster_name}"}
 
-    return {"status": "error", "message": f"Context {cluster_name} not found"}
+    kubeconfig_path = kubeconfig_paths[0]
+    config_data = dict(load_kubeconfig_file(kubeconfig_path))
+    config_data["current-context"] = cluster_name
+    write_kubeconfig(kubeconfig_path, yaml.dump(config_data).encode())
+    return {"status": "success", "message": f"Current context set to {cluster_name}"}
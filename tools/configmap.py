@@ -1,33 +1,54 @@
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
 from core.permissions import check_readonly_permission
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import list_object_names, list_page, selector_query
 from server.server import mcp
-from kubernetes.client import CoreV1Api
+
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def configmap_list(context_name: str, namespace: str):
+def configmap_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                   field_selector: Optional[str] = None, limit: Optional[int] = None,
+                   continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all ConfigMaps in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter ConfigMaps server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter ConfigMaps server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of ConfigMap basic information
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    configmaps = core_v1.list_namespaced_config_map(namespace)
-    result = [{"name": cm.metadata.name} for cm in configmaps.items]
+    api_client = get_api_clients(context_name)["api_client"]
+    path = f"/api/v1/namespaces/{namespace}/configmaps"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(api_client, path, limit, continue_token, metadata_only=True,
+                                 request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    result = list_object_names(api_client, path, request_timeout=request_timeout(timeout), **selectors)
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def configmap_create(context_name: str, namespace: str, name: str, data: dict):
+def configmap_create(context_name: str, namespace: str, name: str, data: dict, timeout: Optional[float] = None):
     """
     Create a ConfigMap in the specified namespace.
 
@@ -36,6 +57,7 @@ def configmap_create(context_name: str, namespace: str, name: str, data: dict):
         namespace: The Kubernetes namespace
         name: The ConfigMap name
         data: The data to store in the ConfigMap
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
@@ -47,13 +69,15 @@ def configmap_create(context_name: str, namespace: str, name: str, data: dict):
         metadata=V1ObjectMeta(name=name),
         data=data
     )
-    created_configmap = core_v1.create_namespaced_config_map(namespace=namespace, body=configmap)
+    created_configmap = core_v1.create_namespaced_config_map(namespace=namespace, body=configmap,
+                                                             _request_timeout=request_timeout(timeout))
     return {"name": created_configmap.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def configmap_get(context_name: str, namespace: str, name: str):
+def configmap_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific ConfigMap.
 
@@ -61,19 +85,22 @@ def configmap_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The ConfigMap name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the ConfigMap
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    configmap = core_v1.read_namespaced_config_map(name=name, namespace=namespace)
+    configmap = core_v1.read_namespaced_config_map(name=name, namespace=namespace,
+                                                   _request_timeout=request_timeout(timeout))
     return {"name": configmap.metadata.name, "data": configmap.data}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def configmap_update(context_name: str, namespace: str, name: str, data: dict):
+def configmap_update(context_name: str, namespace: str, name: str, data: dict, timeout: Optional[float] = None):
     """
     Update an existing ConfigMap in the specified namespace.
 
@@ -82,21 +109,24 @@ def configmap_update(context_name: str, namespace: str, name: str, data: dict):
         namespace: The Kubernetes namespace
         name: The ConfigMap name
         data: The new data to update in the ConfigMap
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    configmap = core_v1.read_namespaced_config_map(name=name, namespace=namespace)
-    configmap.data = data
-    updated_configmap = core_v1.replace_namespaced_config_map(name=name, namespace=namespace, body=configmap)
+    # JSON patch replaces the whole data map in one request, like the former read + replace
+    body = [{"op": "add", "path": "/data", "value": data}]
+    updated_configmap = core_v1.patch_namespaced_config_map(name=name, namespace=namespace, body=body,
+                                                            _request_timeout=request_timeout(timeout))
     return {"name": updated_configmap.metadata.name, "status": "Updated"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def configmap_delete(context_name: str, namespace: str, name: str):
+def configmap_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a ConfigMap from the specified namespace.
 
@@ -104,10 +134,11 @@ def configmap_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The ConfigMap name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    core_v1.delete_namespaced_config_map(name=name, namespace=namespace)
+    core_v1.delete_namespaced_config_map(name=name, namespace=namespace, _request_timeout=request_timeout(timeout))
     return {"name": name, "status": "Deleted"}
@@ -1,33 +1,55 @@
-from kubernetes.client import AppsV1Api, V1DaemonSet, V1ObjectMeta, V1PodTemplateSpec, V1PodSpec, V1Container
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import list_object_names, list_page, selector_query
 from server.server import mcp
 from core.permissions import check_readonly_permission
 
+if TYPE_CHECKING:
+    from kubernetes.client import AppsV1Api
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def daemonset_list(context_name: str, namespace: str):
+def daemonset_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                   field_selector: Optional[str] = None, limit: Optional[int] = None,
+                   continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all DaemonSets in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter DaemonSets server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter DaemonSets server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of DaemonSet basic information
     """
-    apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    daemonsets = apps_v1.list_namespaced_daemon_set(namespace)
-    result = [{"name": ds.metadata.name} for ds in daemonsets.items]
+    api_client = get_api_clients(context_name)["api_client"]
+    path = f"/apis/apps/v1/namespaces/{namespace}/daemonsets"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(api_client, path, limit, continue_token, metadata_only=True,
+                                 request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    result = list_object_names(api_client, path, request_timeout=request_timeout(timeout), **selectors)
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def daemonset_create(context_name: str, namespace: str, name: str, image: str, labels: dict):
+def daemonset_create(context_name: str, namespace: str, name: str, image: str, labels: dict,
+                     timeout: Optional[float] = None):
     """
     Create a DaemonSet in the specified namespace.
 
@@ -37,10 +59,13 @@ def daemonset_create(context_name: str, namespace: str, name: str, image: str, l
         name: The DaemonSet name
         image: The container image to use
         labels: Labels to apply to the DaemonSet
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
+    from kubernetes.client import V1DaemonSet, V1ObjectMeta, V1PodTemplateSpec, V1PodSpec, V1Container
+
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
     daemonset = V1DaemonSet(
         metadata=V1ObjectMeta(name=name, labels=labels),
@@ -52,13 +77,15 @@ def daemonset_create(context_name: str, namespace: str, name: str, image: str, l
             )
         }
     )
-    created_daemonset = apps_v1.create_namespaced_daemon_set(namespace=namespace, body=daemonset)
+    created_daemonset = apps_v1.create_namespaced_daemon_set(namespace=namespace, body=daemonset,
+                                                             _request_timeout=request_timeout(timeout))
     return {"name": created_daemonset.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def daemonset_get(context_name: str, namespace: str, name: str):
+def daemonset_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific DaemonSet.
 
@@ -66,19 +93,22 @@ def daemonset_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The DaemonSet name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the DaemonSet
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    daemonset = apps_v1.read_namespaced_daemon_set(name=name, namespace=namespace)
+    daemonset = apps_v1.read_namespaced_daemon_set(name=name, namespace=namespace,
+                                                   _request_timeout=request_timeout(timeout))
     return {"name": daemonset.metadata.name, "labels": daemonset.metadata.labels, "containers": [c.image for c in daemonset.spec.template.spec.containers]}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def daemonset_update(context_name: str, namespace: str, name: str, image: str):
+def daemonset_update(context_name: str, namespace: str, name: str, image: str, timeout: Optional[float] = None):
     """
     Update an existing DaemonSet in the specified namespace.
 
@@ -87,21 +117,24 @@ def daemonset_update(context_name: str, namespace: str, name: str, image: str):
         namespace: The Kubernetes namespace
         name: The DaemonSet name
         image: The new container image to update
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    daemonset = apps_v1.read_namespaced_daemon_set(name=name, namespace=namespace)
-    daemonset.spec.template.spec.containers[0].image = image
-    updated_daemonset = apps_v1.replace_namespaced_daemon_set(name=name, namespace=namespace, body=daemonset)
+    # Patch the first container by index so no read is needed to learn its name
+    body = [{"op": "replace", "path": "/spec/template/spec/containers/0/image", "value": image}]
+    updated_daemonset = apps_v1.patch_namespaced_daemon_set(name=name, namespace=namespace, body=body,
+                                                            _request_timeout=request_timeout(timeout))
     return {"name": updated_daemonset.metadata.name, "status": "Updated"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def daemonset_delete(context_name: str, namespace: str, name: str):
+def daemonset_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a DaemonSet from the specified namespace.
 
@@ -109,10 +142,11 @@ def daemonset_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The DaemonSet name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    apps_v1.delete_namespaced_daemon_set(name=name, namespace=namespace)
+    apps_v1.delete_namespaced_daemon_set(name=name, namespace=namespace, _request_timeout=request_timeout(timeout))
     return {"name": name, "status": "Deleted"}
\ No newline at end of file
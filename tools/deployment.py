@@ -1,33 +1,55 @@
-from kubernetes.client import AppsV1Api, V1Deployment, V1ObjectMeta, V1PodTemplateSpec, V1PodSpec, V1Container, V1LabelSelector
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
 from core.permissions import check_readonly_permission
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import list_object_names, list_page, selector_query
 from server.server import mcp
 
+if TYPE_CHECKING:
+    from kubernetes.client import AppsV1Api
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def deployment_list(context_name: str, namespace: str):
+def deployment_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                    field_selector: Optional[str] = None, limit: Optional[int] = None,
+                    continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all Deployments in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter Deployments server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter Deployments server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of Deployment basic information
     """
-    apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    deployments = apps_v1.list_namespaced_deployment(namespace)
-    result = [{"name": dep.metadata.name} for dep in deployments.items]
+    api_client = get_api_clients(context_name)["api_client"]
+    path = f"/apis/apps/v1/namespaces/{namespace}/deployments"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(api_client, path, limit, continue_token, metadata_only=True,
+                                 request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    result = list_object_names(api_client, path, request_timeout=request_timeout(timeout), **selectors)
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def deployment_create(context_name: str, namespace: str, name: str, image: str, replicas: int, labels: dict):
+def deployment_create(context_name: str, namespace: str, name: str, image: str, replicas: int, labels: dict,
+                      timeout: Optional[float] = None):
     """
     Create a Deployment in the specified namespace.
 
@@ -38,10 +60,13 @@ def deployment_create(context_name: str, namespace: str, name: str, image: str,
         image: The container image to use
         replicas: Number of replicas
         labels: Labels to apply to the Deployment
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
+    from kubernetes.client import V1Deployment, V1ObjectMeta, V1PodTemplateSpec, V1PodSpec, V1Container, V1LabelSelector
+
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
     deployment = V1Deployment(
         metadata=V1ObjectMeta(name=name, labels=labels),
@@ -54,13 +79,15 @@ def deployment_create(context_name: str, namespace: str, name: str, image: str,
             )
         }
     )
-    created_deployment = apps_v1.create_namespaced_deployment(namespace=namespace, body=deployment)
+    created_deployment = apps_v1.create_namespaced_deployment(namespace=namespace, body=deployment,
+                                                              _request_timeout=request_timeout(timeout))
     return {"name": created_deployment.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def deployment_get(context_name: str, namespace: str, name: str):
+def deployment_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific Deployment.
 
@@ -68,12 +95,14 @@ def deployment_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Deployment name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the Deployment
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    deployment = apps_v1.read_namespaced_deployment(name=name, namespace=namespace)
+    deployment = apps_v1.read_namespaced_deployment(name=name, namespace=namespace,
+                                                    _request_timeout=request_timeout(timeout))
     return {
         "name": deployment.metadata.name,
         "replicas": deployment.spec.replicas,
@@ -83,9 +112,11 @@ def deployment_get(context_name: str, namespace: str, name: str):
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def deployment_update(context_name: str, namespace: str, name: str, image: str, replicas: int):
+def deployment_update(context_name: str, namespace: str, name: str, image: str, replicas: int,
+                      timeout: Optional[float] = None):
     """
     Update an existing Deployment in the specified namespace.
 
@@ -95,22 +126,27 @@ def deployment_update(context_name: str, namespace: str, name: str, image: str,
         name: The Deployment name
         image: The new container image to update
         replicas: The new number of replicas
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    deployment = apps_v1.read_namespaced_deployment(name=name, namespace=namespace)
-    deployment.spec.template.spec.containers[0].image = image
-    deployment.spec.replicas = replicas
-    updated_deployment = apps_v1.replace_namespaced_deployment(name=name, namespace=namespace, body=deployment)
+    # Patch the first container by index so no read is needed to learn its name
+    body = [
+        {"op": "replace", "path": "/spec/template/spec/containers/0/image", "value": image},
+        {"op": "add", "path": "/spec/replicas", "value": replicas},
+    ]
+    updated_deployment = apps_v1.patch_namespaced_deployment(name=name, namespace=namespace, body=body,
+                                                             _request_timeout=request_timeout(timeout))
     return {"name": updated_deployment.metadata.name, "status": "Updated"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def deployment_delete(context_name: str, namespace: str, name: str):
+def deployment_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a Deployment from the specified namespace.
 
@@ -118,10 +154,11 @@ def deployment_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Deployment name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    apps_v1.delete_namespaced_deployment(name=name, namespace=namespace)
+    apps_v1.delete_namespaced_deployment(name=name, namespace=namespace, _request_timeout=request_timeout(timeout))
     return {"name": name, "status": "Deleted"}
\ No newline at end of file
@@ -1,34 +1,55 @@
-from kubernetes.client import NetworkingV1Api, V1Ingress, V1ObjectMeta, V1IngressSpec, V1IngressRule, \
-    V1HTTPIngressRuleValue, V1HTTPIngressPath, V1IngressBackend
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import list_object_names, list_page, selector_query
 from server.server import mcp
 from core.permissions import check_readonly_permission
 
+if TYPE_CHECKING:
+    from kubernetes.client import NetworkingV1Api
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def ingress_list(context_name: str, namespace: str):
+def ingress_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                 field_selector: Optional[str] = None, limit: Optional[int] = None,
+                 continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all Ingresses in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter Ingresses server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter Ingresses server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of Ingress basic information
     """
-    networking_v1: NetworkingV1Api = get_api_clients(context_name)["networking"]
-    ingresses = networking_v1.list_namespaced_ingress(namespace)
-    result = [{"name": ingress.metadata.name} for ingress in ingresses.items]
+    api_client = get_api_clients(context_name)["api_client"]
+    path = f"/apis/networking.k8s.io/v1/namespaces/{namespace}/ingresses"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(api_client, path, limit, continue_token, metadata_only=True,
+                                 request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    result = list_object_names(api_client, path, request_timeout=request_timeout(timeout), **selectors)
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def ingress_create(context_name: str, namespace: str, name: str, host: str, service_name: str, service_port: int):
+def ingress_create(context_name: str, namespace: str, name: str, host: str, service_name: str, service_port: int,
+                   timeout: Optional[float] = None):
     """
     Create an Ingress in the specified namespace.
 
@@ -39,10 +60,14 @@ def ingress_create(context_name: str, namespace: str, name: str, host: str, serv
         host: The host for the Ingress
         service_name: The backend service name
         service_port: The backend service port
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
+    from kubernetes.client import V1Ingress, V1ObjectMeta, V1IngressSpec, V1IngressRule, \
+        V1HTTPIngressRuleValue, V1HTTPIngressPath, V1IngressBackend
+
     networking_v1: NetworkingV1Api = get_api_clients(context_name)["networking"]
     ingress = V1Ingress(
         metadata=V1ObjectMeta(name=name),
@@ -65,13 +90,15 @@ def ingress_create(context_name: str, namespace: str, name: str, host: str, serv
             ]
         )
     )
-    created_ingress = networking_v1.create_namespaced_ingress(namespace=namespace, body=ingress)
+    created_ingress = networking_v1.create_namespaced_ingress(namespace=namespace, body=ingress,
+                                                              _request_timeout=request_timeout(timeout))
     return {"name": created_ingress.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def ingress_get(context_name: str, namespace: str, name: str):
+def ingress_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific Ingress.
 
@@ -79,12 +106,14 @@ def ingress_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Ingress name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the Ingress
     """
     networking_v1: NetworkingV1Api = get_api_clients(context_name)["networking"]
-    ingress = networking_v1.read_namespaced_ingress(name=name, namespace=namespace)
+    ingress = networking_v1.read_namespaced_ingress(name=name, namespace=namespace,
+                                                    _request_timeout=request_timeout(timeout))
     return {
         "name": ingress.metadata.name,
         "host": ingress.spec.rules[0].host if ingress.spec.rules else None,
@@ -100,9 +129,11 @@ def ingress_get(context_name: str, namespace: str, name: str):
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def ingress_update(context_name: str, namespace: str, name: str, host: str, service_name: str, service_port: int):
+def ingress_update(context_name: str, namespace: str, name: str, host: str, service_name: str, service_port: int,
+                   timeout: Optional[float] = None):
     """
     Update an existing Ingress in the specified namespace.
 
@@ -113,23 +144,29 @@ def ingress_update(context_name: str, namespace: str, name: str, host: str, serv
         host: The new host for the Ingress
         service_name: The new backend service name
         service_port: The new backend service port
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     networking_v1: NetworkingV1Api = get_api_clients(context_name)["networking"]
-    ingress = networking_v1.read_namespaced_ingress(name=name, namespace=namespace)
-    ingress.spec.rules[0].host = host
-    ingress.spec.rules[0].http.paths[0].backend.service.name = service_name
-    ingress.spec.rules[0].http.paths[0].backend.service.port.number = service_port
-    updated_ingress = networking_v1.replace_namespaced_ingress(name=name, namespace=namespace, body=ingress)
+    # Patch the first rule and path by index instead of reading and replacing the Ingress
+    backend = "/spec/rules/0/http/paths/0/backend/service"
+    body = [
+        {"op": "add", "path": "/spec/rules/0/host", "value": host},
+        {"op": "replace", "path": f"{backend}/name", "value": service_name},
+        {"op": "add", "path": f"{backend}/port/number", "value": service_port},
+    ]
+    updated_ingress = networking_v1.patch_namespaced_ingress(name=name, namespace=namespace, body=body,
+                                                             _request_timeout=request_timeout(timeout))
     return {"name": updated_ingress.metadata.name, "status": "Updated"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def ingress_delete(context_name: str, namespace: str, name: str):
+def ingress_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete an Ingress from the specified namespace.
 
@@ -137,10 +174,11 @@ def ingress_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Ingress name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     networking_v1: NetworkingV1Api = get_api_clients(context_name)["networking"]
-    networking_v1.delete_namespaced_ingress(name=name, namespace=namespace)
+    networking_v1.delete_namespaced_ingress(name=name, namespace=namespace, _request_timeout=request_timeout(timeout))
     return {"name": name, "status": "Deleted"}
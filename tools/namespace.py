@@ -1,17 +1,52 @@
-import json
-from typing import Dict, Optional
-
-from kubernetes.client import CoreV1Api, V1Namespace, V1ObjectMeta
-from kubernetes.client.rest import ApiException
+from collections import Counter
+from functools import partial
+from typing import Dict, List, Optional, TYPE_CHECKING
 
+from core.cache import invalidates_cache, ttl_cache
+from core.concurrency import run_concurrently, run_per_context, runs_in_thread
 from core.context import use_current_context
 from core.permissions import check_readonly_permission
 from core.kubeconfig import get_api_clients
+from core.listing import iter_object_metadata, iter_raw_items, list_object_names
+from core.resource_versions import last_resource_version, read_not_older_than, remember_resource_version
 from server.server import mcp
 
+if TYPE_CHECKING:
+    from kubernetes.client import AppsV1Api, CoreV1Api
+
+# (resource_counts key, cluster-wide collection path) summarized by list_namespaces_summary
+_SUMMARY_COLLECTIONS = (
+    ("pods", "/api/v1/pods"),
+    ("services", "/api/v1/services"),
+    ("deployments", "/apis/apps/v1/deployments"),
+    ("statefulSets", "/apis/apps/v1/statefulsets"),
+    ("daemonSets", "/apis/apps/v1/daemonsets"),
+    ("configMaps", "/api/v1/configmaps"),
+    ("secrets", "/api/v1/secrets"),
+    ("persistentVolumeClaims", "/api/v1/persistentvolumeclaims"),
+)
+
+
+def _namespace_exists(api_client, namespace: str) -> bool:
+    """
+    Check whether a namespace exists without fetching the namespace object.
+
+    Args:
+        api_client: The kubernetes ApiClient of the context
+        namespace: The name of the namespace
+
+    Returns:
+        True if the namespace exists, False otherwise
+    """
+    matches = iter_object_metadata(api_client, "/api/v1/namespaces",
+                                   fieldSelector=f"metadata.name={namespace}", limit=1)
+    return next(matches, None) is not None
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@ttl_cache
 def list_namespaces(context_name: str):
     """
     List all namespaces in the Kubernetes cluster.
@@ -20,16 +55,32 @@ def list_namespaces(context_name: str):
         context_name: The Kubernetes context name
 
     Returns:
-        JSON string containing basic information about all namespaces
+        Basic information about all namespaces
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    namespaces = core_v1.list_namespace()
-    result = [{"name": ns.metadata.name} for ns in namespaces.items]
-    return json.dumps(result)
+    api_client = get_api_clients(context_name)["api_client"]
+    result = list_object_names(api_client, "/api/v1/namespaces")
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
+def list_namespaces_batch(context_names: List[str]):
+    """
+    List all namespaces in several Kubernetes clusters at once.
+
+    Args:
+        context_names: The Kubernetes context names to query
+
+    Returns:
+        A mapping of context name to its namespaces, or to an error for that context
+    """
+    return run_per_context(list_namespaces, context_names)
+
+
+@mcp.tool()
+@runs_in_thread
 @use_current_context
+@ttl_cache
 def get_namespace_details(context_name: str, namespace: str):
     """
     Get detailed information about a specific namespace.
@@ -39,12 +90,12 @@ def get_namespace_details(context_name: str, namespace: str):
         namespace: The name of the namespace to get details for
 
     Returns:
-        JSON string containing detailed information about the namespace
+        Detailed information about the namespace
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
+    from kubernetes.client.rest import ApiException
 
     try:
-        ns = core_v1.read_namespace(namespace)
+        ns = read_not_older_than(context_name, f"/api/v1/namespaces/{namespace}", "V1Namespace")
 
         # Extract useful information
         result = {
@@ -52,21 +103,22 @@ def get_namespace_details(context_name: str, namespace: str):
             "status": ns.status.phase,
             "labels": ns.metadata.labels if ns.metadata.labels else {},
             "annotations": ns.metadata.annotations if ns.metadata.annotations else {},
-            "created": ns.metadata.creation_timestamp.strftime(
-                "%Y-%m-%dT%H:%M:%SZ") if ns.metadata.creation_timestamp else None
+            "created": ns.metadata.creation_timestamp
         }
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
         if e.status == 404:
-            return json.dumps({"error": f"Namespace '{namespace}' not found"})
+            return {"error": f"Namespace '{namespace}' not found"}
         else:
-            return json.dumps({"error": f"API error: {str(e)}"})
+            return {"error": f"API error: {str(e)}"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def create_namespace(context_name: str, namespace: str, labels: Optional[Dict[str, str]] = None):
     """
     Create a new namespace.
@@ -77,20 +129,14 @@ def create_namespace(context_name: str, namespace: str, labels: Optional[Dict[st
         labels: Optional dictionary of labels to apply to the namespace
 
     Returns:
-        JSON string containing information about the created namespace
+        Information about the created namespace
     """
+    from kubernetes.client import V1Namespace, V1ObjectMeta
+    from kubernetes.client.rest import ApiException
+
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
     try:
-        # Check if namespace already exists
-        try:
-            core_v1.read_namespace(namespace)
-            return json.dumps({"error": f"Namespace '{namespace}' already exists"})
-        except ApiException as e:
-            if e.status != 404:
-                return json.dumps({"error": f"API error: {str(e)}"})
-            # 404 means namespace doesn't exist, so we can proceed
-
         # Create namespace object
         ns_metadata = V1ObjectMeta(name=namespace, labels=labels)
         ns_body = V1Namespace(metadata=ns_metadata)
@@ -105,14 +151,18 @@ def create_namespace(context_name: str, namespace: str, labels: Optional[Dict[st
             "message": f"Namespace '{namespace}' created successfully"
         }
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
-        return json.dumps({"error": f"Failed to create namespace: {str(e)}"})
+        if e.status == 409:
+            return {"error": f"Namespace '{namespace}' already exists"}
+        return {"error": f"Failed to create namespace: {str(e)}"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def delete_namespace(context_name: str, namespace: str):
     """
     Delete a namespace and all resources within it.
@@ -122,20 +172,13 @@ def delete_namespace(context_name: str, namespace: str):
         namespace: The name of the namespace to delete
 
     Returns:
-        JSON string containing the result of the operation
+        The result of the operation
     """
+    from kubernetes.client.rest import ApiException
+
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
     try:
-        # Check if namespace exists
-        try:
-            core_v1.read_namespace(namespace)
-        except ApiException as e:
-            if e.status == 404:
-                return json.dumps({"error": f"Namespace '{namespace}' not found"})
-            else:
-                return json.dumps({"error": f"API error: {str(e)}"})
-
         # Delete the namespace
         core_v1.delete_namespace(namespace)
 
@@ -145,14 +188,18 @@ def delete_namespace(context_name: str, namespace: str):
             "message": f"Namespace '{namespace}' is being deleted"
         }
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
-        return json.dumps({"error": f"Failed to delete namespace: {str(e)}"})
+        if e.status == 404:
+            return {"error": f"Namespace '{namespace}' not found"}
+        return {"error": f"Failed to delete namespace: {str(e)}"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def add_namespace_label(context_name: str, namespace: str, label_key: str, label_value: str):
     """
     Add or update a label on a namespace.
@@ -164,26 +211,17 @@ def add_namespace_label(context_name: str, namespace: str, label_key: str, label
         label_value: The label value to set
 
     Returns:
-        JSON string containing the updated namespace labels
+        The updated namespace labels
     """
+    from kubernetes.client.rest import ApiException
+
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
     try:
-        # Get the current namespace
-        ns = core_v1.read_namespace(namespace)
-
-        # Prepare the patch
-        if not ns.metadata.labels:
-            ns.metadata.labels = {}
-
-        # Update the labels
-        labels = dict(ns.metadata.labels)
-        labels[label_key] = label_value
-
-        # Apply the patch
+        # A strategic merge patch adds or updates the single label without reading the namespace
         body = {
             "metadata": {
-                "labels": labels
+                "labels": {label_key: label_value}
             }
         }
 
@@ -194,17 +232,19 @@ def add_namespace_label(context_name: str, namespace: str, label_key: str, label
             "labels": patched_ns.metadata.labels
         }
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
         if e.status == 404:
-            return json.dumps({"error": f"Namespace '{namespace}' not found"})
+            return {"error": f"Namespace '{namespace}' not found"}
         else:
-            return json.dumps({"error": f"Failed to add label: {str(e)}"})
+            return {"error": f"Failed to add label: {str(e)}"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def remove_namespace_label(context_name: str, namespace: str, label_key: str):
     """
     Remove a label from a namespace.
@@ -215,31 +255,18 @@ def remove_namespace_label(context_name: str, namespace: str, label_key: str):
         label_key: The label key to remove
 
     Returns:
-        JSON string containing the updated namespace labels
+        The updated namespace labels
     """
+    from kubernetes.client.rest import ApiException
+
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
     try:
-        # Get the current namespace
-        ns = core_v1.read_namespace(namespace)
-
-        # Check if the namespace has labels
-        if not ns.metadata.labels or label_key not in ns.metadata.labels:
-            result = {
-                "name": namespace,
-                "labels": ns.metadata.labels,
-                "message": f"Label '{label_key}' not found on namespace"
-            }
-            return json.dumps(result)
-
-        # Update the labels
-        labels = dict(ns.metadata.labels)
-        del labels[label_key]
-
-        # Apply the patch
+        # A null value in a strategic merge patch deletes the label; removing a label
+        # that is not set is a no-op, so no read is needed
         body = {
             "metadata": {
-                "labels": labels
+                "labels": {label_key: None}
             }
         }
 
@@ -250,15 +277,16 @@ def remove_namespace_label(context_name: str, namespace: str, label_key: str):
             "labels": patched_ns.metadata.labels
         }
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
         if e.status == 404:
-            return json.dumps({"error": f"Namespace '{namespace}' not found"})
+            return {"error": f"Namespace '{namespace}' not found"}
         else:
-            return json.dumps({"error": f"Failed to remove label: {str(e)}"})
+            return {"error": f"Failed to remove label: {str(e)}"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 def list_namespace_resources(context_name: str, namespace: str):
     """
@@ -269,74 +297,137 @@ def list_namespace_resources(context_name: str, namespace: str):
         namespace: The name of the namespace
 
     Returns:
-        JSON string containing a summary of resources in the namespace
+        A summary of resources in the namespace
     """
-    from kubernetes.client import AppsV1Api
+    from kubernetes.client.rest import ApiException
 
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    apps_v1 = get_api_clients(context_name).get("apps", AppsV1Api(get_api_clients(context_name)["api_client"]))
+    clients = get_api_clients(context_name)
+    core_v1: CoreV1Api = clients["core"]
+    apps_v1: AppsV1Api = clients["apps"]
+    api_client = clients["api_client"]
 
-    try:
-        # Check if namespace exists
-        try:
-            core_v1.read_namespace(namespace)
-        except ApiException as e:
-            if e.status == 404:
-                return json.dumps({"error": f"Namespace '{namespace}' not found"})
-            else:
-                return json.dumps({"error": f"API error: {str(e)}"})
+    # Every list is paginated and projected page by page, so memory stays bounded by
+    # the page size. Kinds that are only counted are listed as metadata only.
+    def pod_summaries():
+        return [{"name": pod["metadata"]["name"], "status": pod.get("status", {}).get("phase")}
+                for pod in iter_raw_items(core_v1.list_namespaced_pod, namespace)]
 
-        # Get pods
-        pods = core_v1.list_namespaced_pod(namespace)
+    def service_summaries():
+        return [{"name": svc["metadata"]["name"], "type": svc["spec"].get("type"),
+                 "cluster_ip": svc["spec"].get("clusterIP")}
+                for svc in iter_raw_items(core_v1.list_namespaced_service, namespace)]
 
-        # Get services
-        services = core_v1.list_namespaced_service(namespace)
+    def deployment_summaries():
+        return [{"name": deploy["metadata"]["name"], "replicas": deploy["spec"].get("replicas")}
+                for deploy in iter_raw_items(apps_v1.list_namespaced_deployment, namespace)]
 
-        # Get deployments
-        deployments = apps_v1.list_namespaced_deployment(namespace)
+    def count(resource: str, group: str = "/api/v1") -> int:
+        path = f"{group}/namespaces/{namespace}/{resource}"
+        return sum(1 for _ in iter_object_metadata(api_client, path))
 
-        # Get stateful sets
-        stateful_sets = apps_v1.list_namespaced_stateful_set(namespace)
-
-        # Get daemon sets
-        daemon_sets = apps_v1.list_namespaced_daemon_set(namespace)
-
-        # Get config maps
-        config_maps = core_v1.list_namespaced_config_map(namespace)
-
-        # Get secrets
-        secrets = core_v1.list_namespaced_secret(namespace)
-
-        # Get persistent volume claims
-        pvcs = core_v1.list_namespaced_persistent_volume_claim(namespace)
+    try:
+        # The lists are independent, so fetch them in parallel. Namespaced lists of a
+        # missing namespace are simply empty, so the existence check runs alongside them.
+        exists, pods, services, deployments, stateful_sets, daemon_sets, config_maps, secrets, pvcs = run_concurrently(
+            partial(_namespace_exists, api_client, namespace),
+            pod_summaries,
+            service_summaries,
+            deployment_summaries,
+            partial(count, "statefulsets", "/apis/apps/v1"),
+            partial(count, "daemonsets", "/apis/apps/v1"),
+            partial(count, "configmaps"),
+            partial(count, "secrets"),
+            partial(count, "persistentvolumeclaims"),
+        )
+        if not exists:
+            return {"error": f"Namespace '{namespace}' not found"}
 
         result = {
             "namespace": namespace,
             "resource_counts": {
-                "pods": len(pods.items),
-                "services": len(services.items),
-                "deployments": len(deployments.items),
-                "statefulSets": len(stateful_sets.items),
-                "daemonSets": len(daemon_sets.items),
-                "configMaps": len(config_maps.items),
-                "secrets": len(secrets.items),
-                "persistentVolumeClaims": len(pvcs.items)
+                "pods": len(pods),
+                "services": len(services),
+                "deployments": len(deployments),
+                "statefulSets": stateful_sets,
+                "daemonSets": daemon_sets,
+                "configMaps": config_maps,
+                "secrets": secrets,
+                "persistentVolumeClaims": pvcs
             },
-            "pods": [{"name": pod.metadata.name, "status": pod.status.phase} for pod in pods.items],
-            "services": [{"name": svc.metadata.name, "type": svc.spec.type, "cluster_ip": svc.spec.cluster_ip} for svc
-                         in services.items],
-            "deployments": [{"name": deploy.metadata.name, "replicas": deploy.spec.replicas} for deploy in
-                            deployments.items]
+            "pods": pods,
+            "services": services,
+            "deployments": deployments
         }
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
-        return json.dumps({"error": f"Failed to list namespace resources: {str(e)}"})
+        if e.status == 404:
+            return {"error": f"Namespace '{namespace}' not found"}
+        return {"error": f"Failed to list namespace resources: {str(e)}"}
 
 
 @mcp.tool()
+@runs_in_thread
+def list_namespace_resources_batch(context_names: List[str], namespace: Optional[str] = None):
+    """
+    List resources (pods, services, deployments, etc.) in a namespace of several clusters at once.
+
+    Args:
+        context_names: The Kubernetes context names to query
+        namespace: The name of the namespace; defaults to each context's default namespace
+
+    Returns:
+        A mapping of context name to its resource summary, or to an error for that context
+    """
+    return run_per_context(list_namespace_resources, context_names, namespace=namespace)
+
+
+@mcp.tool()
+@runs_in_thread
+@use_current_context
+@ttl_cache
+def list_namespaces_summary(context_name: str):
+    """
+    Count the resources (pods, services, deployments, etc.) of every namespace at once.
+
+    Args:
+        context_name: The Kubernetes context name
+
+    Returns:
+        Resource counts for each namespace in the cluster
+    """
+    from kubernetes.client.rest import ApiException
+
+    api_client = get_api_clients(context_name)["api_client"]
+
+    def count_by_namespace(path: str) -> Counter:
+        return Counter(meta["namespace"] for meta in iter_object_metadata(api_client, path))
+
+    try:
+        # One paginated, metadata-only list per resource kind across all namespaces,
+        # instead of one list per kind and namespace
+        namespaces, *counts = run_concurrently(
+            partial(list_object_names, api_client, "/api/v1/namespaces"),
+            *(partial(count_by_namespace, path) for _, path in _SUMMARY_COLLECTIONS),
+        )
+
+        return [
+            {
+                "namespace": namespace,
+                "resource_counts": {
+                    key: counter[namespace] for (key, _), counter in zip(_SUMMARY_COLLECTIONS, counts)
+                }
+            } for namespace in (ns["name"] for ns in namespaces)
+        ]
+    except ApiException as e:
+        return {"error": f"Failed to summarize namespaces: {str(e)}"}
+
+
+@mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def set_namespace_resource_quota(context_name: str, namespace: str,
                                  cpu_limit: Optional[str] = None,
                                  memory_limit: Optional[str] = None,
@@ -352,26 +443,19 @@ def set_namespace_resource_quota(context_name: str, namespace: str,
         pod_count: Optional maximum number of pods
 
     Returns:
-        JSON string containing the resource quota status
+        The resource quota status
     """
+    from kubernetes.client import V1ObjectMeta
     from kubernetes.client.models.v1_resource_quota import V1ResourceQuota
     from kubernetes.client.models.v1_resource_quota_spec import V1ResourceQuotaSpec
+    from kubernetes.client.rest import ApiException
 
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
     try:
-        # Check if namespace exists
-        try:
-            core_v1.read_namespace(namespace)
-        except ApiException as e:
-            if e.status == 404:
-                return json.dumps({"error": f"Namespace '{namespace}' not found"})
-            else:
-                return json.dumps({"error": f"API error: {str(e)}"})
-
         # If no limits are provided, return error
         if not any([cpu_limit, memory_limit, pod_count]):
-            return json.dumps({"error": "At least one resource limit must be specified"})
+            return {"error": "At least one resource limit must be specified"}
 
         # Prepare the resource quota
         quota_name = f"{namespace}-resource-quota"
@@ -386,10 +470,8 @@ def set_namespace_resource_quota(context_name: str, namespace: str,
         if pod_count:
             hard_quotas["pods"] = str(pod_count)
 
-        # Check if quota already exists
+        # Update the quota in place; a 404 means it does not exist yet
         try:
-            existing_quota = core_v1.read_namespaced_resource_quota(quota_name, namespace)
-            # Update existing quota
             body = {
                 "spec": {
                     "hard": hard_quotas
@@ -419,15 +501,20 @@ def set_namespace_resource_quota(context_name: str, namespace: str,
                     "message": "Resource quota created successfully"
                 }
             else:
-                return json.dumps({"error": f"API error: {str(e)}"})
+                return {"error": f"API error: {str(e)}"}
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
-        return json.dumps({"error": f"Failed to set resource quota: {str(e)}"})
+        # Creating the quota fails with 404 when the namespace itself is missing
+        if e.status == 404:
+            return {"error": f"Namespace '{namespace}' not found"}
+        return {"error": f"Failed to set resource quota: {str(e)}"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@ttl_cache
 def get_namespace_resource_quota(context_name: str, namespace: str):
     """
     Get current resource quotas for a namespace.
@@ -437,28 +524,35 @@ def get_namespace_resource_quota(context_name: str, namespace: str):
         namespace: The name of the namespace
 
     Returns:
-        JSON string containing the current resource quotas and their usage
+        The current resource quotas and their usage
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
+    from kubernetes.client.rest import ApiException
 
-    try:
-        # Check if namespace exists
-        try:
-            core_v1.read_namespace(namespace)
-        except ApiException as e:
-            if e.status == 404:
-                return json.dumps({"error": f"Namespace '{namespace}' not found"})
-            else:
-                return json.dumps({"error": f"API error: {str(e)}"})
+    clients = get_api_clients(context_name)
+    core_v1: CoreV1Api = clients["core"]
 
+    try:
         # Get all resource quotas in the namespace
-        quotas = core_v1.list_namespaced_resource_quota(namespace)
+        path = f"/api/v1/namespaces/{namespace}/resourcequotas"
+        resource_version = last_resource_version(context_name, path)
+        if resource_version:
+            # Let the API server answer from its watch cache with data not older than the last read
+            quotas = core_v1.list_namespaced_resource_quota(
+                namespace, resource_version=resource_version, resource_version_match="NotOlderThan")
+        else:
+            quotas = core_v1.list_namespaced_resource_quota(namespace)
+        remember_resource_version(context_name, path, quotas.metadata.resource_version)
 
         if not quotas.items:
-            return json.dumps({
+            # Listing a missing namespace returns an empty list, so only check that it
+            # exists when there is nothing to report
+            if not _namespace_exists(clients["api_client"], namespace):
+                return {"error": f"Namespace '{namespace}' not found"}
+
+            return {
                 "namespace": namespace,
                 "message": "No resource quotas defined for this namespace"
-            })
+            }
 
         quota_info = []
         for quota in quotas.items:
@@ -474,6 +568,6 @@ def get_namespace_resource_quota(context_name: str, namespace: str):
             "quotas": quota_info
         }
 
-        return json.dumps(result)
+        return result
     except ApiException as e:
-        return json.dumps({"error": f"Failed to get resource quotas: {str(e)}"})
+        return {"error": f"Failed to get resource quotas: {str(e)}"}
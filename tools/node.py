@@ -1,15 +1,34 @@
-import json
-
-from kubernetes.client import CoreV1Api
-from kubernetes.client.models.v1_taint import V1Taint
+from typing import List, TYPE_CHECKING
 
+from core.cache import invalidates_cache, ttl_cache
+from core.concurrency import run_per_context, runs_in_thread
 from core.context import use_current_context
 from core.kubeconfig import get_api_clients
+from core.listing import iter_raw_items, list_object_names
+from core.resource_versions import read_not_older_than
 from server.server import mcp
 
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
+
+
+def _taints_to_dicts(taints) -> List[dict]:
+    """
+    Project V1Taint objects to the {"key", "value", "effect"} dicts returned by the node tools.
+
+    Args:
+        taints: The node's spec.taints, possibly None
+
+    Returns:
+        A list of taint dicts
+    """
+    return [{"key": taint.key, "value": taint.value, "effect": taint.effect} for taint in taints or []]
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@ttl_cache
 def list_nodes(context_name: str):
     """
     List all nodes in the Kubernetes cluster.
@@ -18,16 +37,32 @@ def list_nodes(context_name: str):
         context_name: The Kubernetes context name
 
     Returns:
-        JSON string containing basic information about all nodes
+        Basic information about all nodes
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    nodes = core_v1.list_node()
-    result = [{"name": node.metadata.name} for node in nodes.items]
-    return json.dumps(result)
+    api_client = get_api_clients(context_name)["api_client"]
+    result = list_object_names(api_client, "/api/v1/nodes")
+    return result
+
+
+@mcp.tool()
+@runs_in_thread
+def list_nodes_batch(context_names: List[str]):
+    """
+    List all nodes in several Kubernetes clusters at once.
+
+    Args:
+        context_names: The Kubernetes context names to query
+
+    Returns:
+        A mapping of context name to its nodes, or to an error for that context
+    """
+    return run_per_context(list_nodes, context_names)
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@ttl_cache
 def get_node_details(context_name: str, node_name: str):
     """
     Get detailed information about a specific node.
@@ -37,36 +72,18 @@ def get_node_details(context_name: str, node_name: str):
         node_name: The name of the node to get details for
 
     Returns:
-        JSON string containing detailed information about the node
+        Detailed information about the node
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    node = core_v1.read_node(node_name)
+    node = read_not_older_than(context_name, f"/api/v1/nodes/{node_name}", "V1Node")
 
     # Extract useful information
-    node_info = node.status.node_info
-    conditions = {cond.type: cond.status for cond in node.status.conditions}
-    capacity = {k: v for k, v in node.status.capacity.items()}
-    allocatable = {k: v for k, v in node.status.allocatable.items()}
-
-    # Format taints if present
-    taints = []
-    if node.spec.taints:
-        taints = [{
-            "key": taint.key,
-            "value": taint.value,
-            "effect": taint.effect
-        } for taint in node.spec.taints]
-
-    # Extract labels and annotations
-    labels = {}
-    annotations = {}
-    if node.metadata.labels:
-        labels = node.metadata.labels
-    if node.metadata.annotations:
-        annotations = node.metadata.annotations
+    status = node.status
+    metadata = node.metadata
+    node_info = status.node_info
+    conditions = {cond.type: cond.status for cond in status.conditions or []}
 
     result = {
-        "name": node.metadata.name,
+        "name": metadata.name,
         "info": {
             "architecture": node_info.architecture,
             "bootID": node_info.boot_id,
@@ -80,21 +97,23 @@ def get_node_details(context_name: str, node_name: str):
             "systemUUID": node_info.system_uuid
         },
         "conditions": conditions,
-        "capacity": capacity,
-        "allocatable": allocatable,
-        "labels": labels,
-        "annotations": annotations,
-        "taints": taints,
-        "addresses": [{"type": addr.type, "address": addr.address} for addr in node.status.addresses],
-        "created": node.metadata.creation_timestamp.strftime(
-            "%Y-%m-%dT%H:%M:%SZ") if node.metadata.creation_timestamp else None
+        # The client already deserializes these maps into plain dicts, so no copies are made
+        "capacity": status.capacity or {},
+        "allocatable": status.allocatable or {},
+        "labels": metadata.labels or {},
+        "annotations": metadata.annotations or {},
+        "taints": _taints_to_dicts(node.spec.taints),
+        "addresses": [{"type": addr.type, "address": addr.address} for addr in status.addresses or []],
+        "created": metadata.creation_timestamp
     }
 
-    return json.dumps(result)
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@invalidates_cache
 def add_node_label(context_name: str, node_name: str, label_key: str, label_value: str):
     """
     Add or update a label to a node.
@@ -106,25 +125,14 @@ def add_node_label(context_name: str, node_name: str, label_key: str, label_valu
         label_value: The label value to set
 
     Returns:
-        JSON string containing the updated node labels
+        The updated node labels
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
-    # Get the current node
-    node = core_v1.read_node(node_name)
-
-    # Prepare the patch
-    if not node.metadata.labels:
-        node.metadata.labels = {}
-
-    # Update the labels
-    labels = dict(node.metadata.labels)
-    labels[label_key] = label_value
-
-    # Apply the patch
+    # A strategic merge patch adds or updates the single label without reading the node
     body = {
         "metadata": {
-            "labels": labels
+            "labels": {label_key: label_value}
         }
     }
 
@@ -135,11 +143,13 @@ def add_node_label(context_name: str, node_name: str, label_key: str, label_valu
         "labels": patched_node.metadata.labels
     }
 
-    return json.dumps(result)
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@invalidates_cache
 def remove_node_label(context_name: str, node_name: str, label_key: str):
     """
     Remove a label from a node.
@@ -150,30 +160,15 @@ def remove_node_label(context_name: str, node_name: str, label_key: str):
         label_key: The label key to remove
 
     Returns:
-        JSON string containing the updated node labels
+        The updated node labels
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
-    # Get the current node
-    node = core_v1.read_node(node_name)
-
-    # Check if the node has labels
-    if not node.metadata.labels or label_key not in node.metadata.labels:
-        result = {
-            "name": node_name,
-            "labels": node.metadata.labels,
-            "message": f"Label '{label_key}' not found on node"
-        }
-        return json.dumps(result)
-
-    # Update the labels
-    labels = dict(node.metadata.labels)
-    del labels[label_key]
-
-    # Apply the patch
+    # A null value in a strategic merge patch deletes the label; removing a label
+    # that is not set is a no-op, so no read is needed
     body = {
         "metadata": {
-            "labels": labels
+            "labels": {label_key: None}
         }
     }
 
@@ -184,11 +179,13 @@ def remove_node_label(context_name: str, node_name: str, label_key: str):
         "labels": patched_node.metadata.labels
     }
 
-    return json.dumps(result)
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@invalidates_cache
 def add_node_taint(context_name: str, node_name: str, taint_key: str,
                    taint_value: str, taint_effect: str):
     """
@@ -202,7 +199,7 @@ def add_node_taint(context_name: str, node_name: str, taint_key: str,
         taint_effect: The taint effect (NoSchedule, PreferNoSchedule, or NoExecute)
 
     Returns:
-        JSON string containing the updated node taints
+        The updated node taints
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
@@ -212,73 +209,40 @@ def add_node_taint(context_name: str, node_name: str, taint_key: str,
         result = {
             "error": f"Invalid taint effect. Must be one of {', '.join(valid_effects)}"
         }
-        return json.dumps(result)
+        return result
 
-    # Get the current node
+    # Taints are a list without a merge key, so read the node once to find an existing
+    # taint with this key; the JSON patch then only touches that entry
     node = core_v1.read_node(node_name)
-
-    # Prepare the taints
-    current_taints = []
-    if node.spec.taints:
-        current_taints = node.spec.taints
-
-    # Check if taint with this key already exists
-    exists = False
-    for i, taint in enumerate(current_taints):
-        if taint.key == taint_key:
-            # Update existing taint
-            current_taints[i] = V1Taint(
-                key=taint_key,
-                value=taint_value,
-                effect=taint_effect
-            )
-            exists = True
-            break
-
-    # Add new taint if it doesn't exist
-    if not exists:
-        current_taints.append(V1Taint(
-            key=taint_key,
-            value=taint_value,
-            effect=taint_effect
-        ))
-
-    # Apply the patch
-    body = {
-        "spec": {
-            "taints": [
-                {
-                    "key": taint.key,
-                    "value": taint.value,
-                    "effect": taint.effect
-                } for taint in current_taints
-            ]
-        }
-    }
+    current_taints = node.spec.taints or []
+    taint = {"key": taint_key, "value": taint_value, "effect": taint_effect}
+    index = next((i for i, t in enumerate(current_taints) if t.key == taint_key), None)
+
+    if index is not None:
+        # The test op fails the patch if the list changed since it was read
+        body = [
+            {"op": "test", "path": f"/spec/taints/{index}/key", "value": taint_key},
+            {"op": "replace", "path": f"/spec/taints/{index}", "value": taint},
+        ]
+    elif current_taints:
+        body = [{"op": "add", "path": "/spec/taints/-", "value": taint}]
+    else:
+        body = [{"op": "add", "path": "/spec/taints", "value": [taint]}]
 
     patched_node = core_v1.patch_node(node_name, body)
 
-    # Format the taints for response
-    response_taints = []
-    if patched_node.spec.taints:
-        response_taints = [
-            {
-                "key": taint.key,
-                "value": taint.value,
-                "effect": taint.effect
-            } for taint in patched_node.spec.taints
-        ]
-
     result = {
         "name": patched_node.metadata.name,
-        "taints": response_taints
+        "taints": _taints_to_dicts(patched_node.spec.taints)
     }
 
-    return json.dumps(result)
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@invalidates_cache
 def remove_node_taint(context_name: str, node_name: str, taint_key: str):
     """
     Remove a taint from a node.
@@ -289,7 +253,7 @@ def remove_node_taint(context_name: str, node_name: str, taint_key: str):
         taint_key: The taint key to remove
 
     Returns:
-        JSON string containing the updated node taints
+        The updated node taints
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
@@ -303,57 +267,40 @@ def remove_node_taint(context_name: str, node_name: str, taint_key: str):
             "taints": [],
             "message": "Node has no taints"
         }
-        return json.dumps(result)
+        return result
 
-    # Filter out the taint to remove
-    updated_taints = [taint for taint in node.spec.taints if taint.key != taint_key]
+    # Find the taint to remove
+    index = next((i for i, t in enumerate(node.spec.taints) if t.key == taint_key), None)
 
     # Check if taint was found
-    if len(updated_taints) == len(node.spec.taints):
+    if index is None:
         result = {
             "name": node_name,
-            "taints": [{"key": taint.key, "value": taint.value, "effect": taint.effect}
-                       for taint in node.spec.taints],
+            "taints": _taints_to_dicts(node.spec.taints),
             "message": f"Taint with key '{taint_key}' not found"
         }
-        return json.dumps(result)
+        return result
 
-    # Apply the patch
-    body = {
-        "spec": {
-            "taints": [
-                {
-                    "key": taint.key,
-                    "value": taint.value,
-                    "effect": taint.effect
-                } for taint in updated_taints
-            ]
-        }
-    }
+    # Remove only that entry; the test op fails the patch if the list changed since it was read
+    body = [
+        {"op": "test", "path": f"/spec/taints/{index}/key", "value": taint_key},
+        {"op": "remove", "path": f"/spec/taints/{index}"},
+    ]
 
     patched_node = core_v1.patch_node(node_name, body)
 
-    # Format the taints for response
-    response_taints = []
-    if patched_node.spec.taints:
-        response_taints = [
-            {
-                "key": taint.key,
-                "value": taint.value,
-                "effect": taint.effect
-            } for taint in patched_node.spec.taints
-        ]
-
     result = {
         "name": patched_node.metadata.name,
-        "taints": response_taints
+        "taints": _taints_to_dicts(patched_node.spec.taints)
     }
 
-    return json.dumps(result)
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@invalidates_cache
 def cordon_node(context_name: str, node_name: str):
     """
     Cordon a node (mark as unschedulable).
@@ -363,7 +310,7 @@ def cordon_node(context_name: str, node_name: str):
         node_name: The name of the node to cordon
 
     Returns:
-        JSON string containing the result of the operation
+        The result of the operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
@@ -377,7 +324,7 @@ def cordon_node(context_name: str, node_name: str):
             "status": "already cordoned",
             "unschedulable": True
         }
-        return json.dumps(result)
+        return result
 
     # Apply the patch
     body = {
@@ -394,11 +341,13 @@ def cordon_node(context_name: str, node_name: str):
         "unschedulable": patched_node.spec.unschedulable
     }
 
-    return json.dumps(result)
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@invalidates_cache
 def uncordon_node(context_name: str, node_name: str):
     """
     Uncordon a node (mark as schedulable).
@@ -408,7 +357,7 @@ def uncordon_node(context_name: str, node_name: str):
         node_name: The name of the node to uncordon
 
     Returns:
-        JSON string containing the result of the operation
+        The result of the operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
@@ -422,7 +371,7 @@ def uncordon_node(context_name: str, node_name: str):
             "status": "already schedulable",
             "unschedulable": False
         }
-        return json.dumps(result)
+        return result
 
     # Apply the patch
     body = {
@@ -439,11 +388,13 @@ def uncordon_node(context_name: str, node_name: str):
         "unschedulable": patched_node.spec.unschedulable
     }
 
-    return json.dumps(result)
+    return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@ttl_cache
 def get_node_pods(context_name: str, node_name: str):
     """
     Get all pods running on a specific node.
@@ -453,20 +404,20 @@ def get_node_pods(context_name: str, node_name: str):
         node_name: The name of the node to get pods for
 
     Returns:
-        JSON string containing the pods running on the node
+        The pods running on the node
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
-    # Get all pods in all namespaces
-    pods = core_v1.list_pod_for_all_namespaces(field_selector=f"spec.nodeName={node_name}")
+    # Get all pods in all namespaces, decoded straight from the raw response
+    pods = iter_raw_items(core_v1.list_pod_for_all_namespaces, field_selector=f"spec.nodeName={node_name}")
 
     pod_list = [
         {
-            "name": pod.metadata.name,
-            "namespace": pod.metadata.namespace,
-            "status": pod.status.phase,
-            "containers": [c.name for c in pod.spec.containers]
-        } for pod in pods.items
+            "name": pod["metadata"]["name"],
+            "namespace": pod["metadata"]["namespace"],
+            "status": pod.get("status", {}).get("phase"),
+            "containers": [c["name"] for c in pod["spec"]["containers"]]
+        } for pod in pods
     ]
 
     result = {
@@ -475,4 +426,4 @@ def get_node_pods(context_name: str, node_name: str):
         "pod_count": len(pod_list)
     }
 
-    return json.dumps(result)
+    return result
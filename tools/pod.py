@@ -1,32 +1,93 @@
-from typing import Optional, Dict, List
+from collections import defaultdict
+from itertools import islice
+from typing import Optional, Dict, List, TYPE_CHECKING
 
+from core.cache import invalidates_cache, ttl_cache
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
 from core.permissions import check_readonly_permission
 from server.server import mcp
-from kubernetes.client import CoreV1Api
 from core.kubeconfig import get_api_clients
+from core.listing import iter_object_metadata, list_object_names, read_raw_object, selector_query
+from core.watch_cache import await_write, cached_object, cached_objects, visible_annotations
+
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
+
+# Maximum number of environment variables listed per container by pod_detail
+POD_DETAIL_MAX_ENV = 32
+
+# Default cap on the number of log bytes returned by pod_logs
+POD_LOGS_MAX_BYTES = 1024 * 1024
+
+# Size of the reads used to stream pod logs
+POD_LOGS_CHUNK_SIZE = 64 * 1024
+
+# (volume source key, projection of the source) in the order volume types are checked
+_VOLUME_TYPES = (
+    ("configMap", lambda v: {"type": "configMap", "config_map_name": v.get("name")}),
+    ("secret", lambda v: {"type": "secret", "secret_name": v.get("secretName")}),
+    ("persistentVolumeClaim", lambda v: {"type": "pvc", "claim_name": v.get("claimName")}),
+    ("hostPath", lambda v: {"type": "hostPath", "path": v.get("path")}),
+    ("emptyDir", lambda v: {"type": "emptyDir"}),
+)
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def pod_list(context_name: str, namespace: str):
+@ttl_cache
+def pod_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+             field_selector: Optional[str] = None):
     """
     List all pods in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter pods server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter pods server-side (e.g., "status.phase=Running")
 
     Returns:
         List of pod basic information
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    pods = core_v1.list_namespaced_pod(namespace)
-    result = [{"name": pod.metadata.name} for pod in pods.items]
+    if not (label_selector or field_selector):
+        pods = cached_objects(context_name, f"/api/v1/namespaces/{namespace}/pods")
+        if pods is not None:
+            return [{"name": pod["metadata"]["name"]} for pod in pods]
+
+    api_client = get_api_clients(context_name)["api_client"]
+    path = f"/api/v1/namespaces/{namespace}/pods"
+    result = list_object_names(api_client, path, **selector_query(label_selector, field_selector))
     return result
 
 
 @mcp.tool()
+@runs_in_thread
+@use_current_context
+@ttl_cache
+def pod_list_all(context_name: str, label_selector: Optional[str] = None):
+    """
+    List the pods of every namespace with a single (paginated) request.
+
+    Args:
+        context_name: The Kubernetes context name
+        label_selector: Optional label selector to filter pods server-side (e.g., "app=nginx")
+
+    Returns:
+        Dict mapping each namespace to its list of pod basic information
+    """
+    api_client = get_api_clients(context_name)["api_client"]
+    query = {"labelSelector": label_selector} if label_selector else {}
+
+    result = defaultdict(list)
+    for metadata in iter_object_metadata(api_client, "/api/v1/pods", **query):
+        result[metadata["namespace"]].append({"name": metadata["name"]})
+    return dict(result)
+
+
+@mcp.tool()
+@runs_in_thread
 @use_current_context
 def pod_detail(context_name: str, namespace: str, name: str):
     """
@@ -40,132 +101,130 @@ def pod_detail(context_name: str, namespace: str, name: str):
     Returns:
         Detailed information about the pod
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    pod = core_v1.read_namespaced_pod(name, namespace)
+    pod = cached_object(context_name, f"/api/v1/namespaces/{namespace}/pods", name)
+    if pod is None:
+        core_v1: CoreV1Api = get_api_clients(context_name)["core"]
+        pod = read_raw_object(core_v1.read_namespaced_pod, name, namespace)
+
+    metadata = pod["metadata"]
+    spec = pod.get("spec") or {}
+    status = pod.get("status") or {}
 
     containers = []
-    for c in pod.spec.containers:
+    for c in spec.get("containers") or []:
+        resources = c.get("resources")
+        env_vars = c.get("env") or []
         container_info = {
-            "name": c.name,
-            "image": c.image,
-            "ports": [{"container_port": p.container_port, "protocol": p.protocol} for p in (c.ports or [])],
+            "name": c.get("name"),
+            "image": c.get("image"),
+            "ports": [{"container_port": p.get("containerPort"), "protocol": p.get("protocol")}
+                      for p in (c.get("ports") or [])],
             "resources": {
-                "requests": c.resources.requests if c.resources and hasattr(c.resources, "requests") else {},
-                "limits": c.resources.limits if c.resources and hasattr(c.resources, "limits") else {}
+                "requests": resources.get("requests") if resources is not None else {},
+                "limits": resources.get("limits") if resources is not None else {}
             },
-            "environment": [{"name": env.name, "value": env.value if hasattr(env, "value") else "from secret"}
-                            for env in (c.env or [])]
+            "environment": [{"name": env.get("name"), "value": env.get("value")}
+                            for env in islice(env_vars, POD_DETAIL_MAX_ENV)],
+            "environment_truncated": len(env_vars) > POD_DETAIL_MAX_ENV
         }
         containers.append(container_info)
 
     volumes = []
-    if pod.spec.volumes:
-        for vol in pod.spec.volumes:
-            volume_info = {"name": vol.name}
-            # 볼륨 타입 확인 및 정보 추가
-            if hasattr(vol, "config_map") and vol.config_map:
-                volume_info["type"] = "configMap"
-                volume_info["config_map_name"] = vol.config_map.name
-            elif hasattr(vol, "secret") and vol.secret:
-                volume_info["type"] = "secret"
-                volume_info["secret_name"] = vol.secret.secret_name
-            elif hasattr(vol, "persistent_volume_claim") and vol.persistent_volume_claim:
-                volume_info["type"] = "pvc"
-                volume_info["claim_name"] = vol.persistent_volume_claim.claim_name
-            elif hasattr(vol, "host_path") and vol.host_path:
-                volume_info["type"] = "hostPath"
-                volume_info["path"] = vol.host_path.path
-            elif hasattr(vol, "empty_dir") and vol.empty_dir:
-                volume_info["type"] = "emptyDir"
-            else:
-                volume_info["type"] = "other"
-            volumes.append(volume_info)
-
-    conditions = []
-    if pod.status.conditions:
-        for condition in pod.status.conditions:
-            conditions.append({
-                "type": condition.type,
-                "status": condition.status,
-                "last_transition_time": condition.last_transition_time,
-                "reason": condition.reason,
-                "message": condition.message
-            })
+    for vol in spec.get("volumes") or []:
+        volume_info = {"name": vol.get("name")}
+        # 볼륨 타입 확인 및 정보 추가
+        for key, describe in _VOLUME_TYPES:
+            source = vol.get(key)
+            if source is not None:
+                volume_info.update(describe(source))
+                break
+        else:
+            volume_info["type"] = "other"
+        volumes.append(volume_info)
+
+    conditions = [{
+        "type": condition.get("type"),
+        "status": condition.get("status"),
+        "last_transition_time": condition.get("lastTransitionTime"),
+        "reason": condition.get("reason"),
+        "message": condition.get("message")
+    } for condition in (status.get("conditions") or [])]
 
     networking = {
-        "pod_ip": pod.status.pod_ip,
-        "host_ip": pod.status.host_ip,
-        "node_name": pod.spec.node_name
+        "pod_ip": status.get("podIP"),
+        "host_ip": status.get("hostIP"),
+        "node_name": spec.get("nodeName")
     }
 
-    metadata = {
-        "creation_timestamp": pod.metadata.creation_timestamp,
-        "labels": pod.metadata.labels or {},
-        "annotations": pod.metadata.annotations or {},
+    pod_metadata = {
+        "creation_timestamp": metadata.get("creationTimestamp"),
+        "labels": metadata.get("labels") or {},
+        "annotations": visible_annotations(metadata.get("annotations")),
         "owner_references": [{
-            "kind": ref.kind,
-            "name": ref.name,
-            "uid": ref.uid
-        } for ref in (pod.metadata.owner_references or [])]
+            "kind": ref.get("kind"),
+            "name": ref.get("name"),
+            "uid": ref.get("uid")
+        } for ref in (metadata.get("ownerReferences") or [])]
     }
 
     status_info = {
-        "phase": pod.status.phase,
-        "start_time": pod.status.start_time,
+        "phase": status.get("phase"),
+        "start_time": status.get("startTime"),
         "container_statuses": []
     }
 
-    if pod.status.container_statuses:
-        for cs in pod.status.container_statuses:
-            container_status = {
-                "name": cs.name,
-                "ready": cs.ready,
-                "restart_count": cs.restart_count,
-                "image": cs.image,
-                "image_id": cs.image_id,
-                "container_id": cs.container_id
-            }
-
-            if cs.state:
-                state_info = {}
-                if hasattr(cs.state, "running") and cs.state.running:
-                    state_info["current"] = "running"
-                    state_info["started_at"] = cs.state.running.started_at
-                elif hasattr(cs.state, "waiting") and cs.state.waiting:
-                    state_info["current"] = "waiting"
-                    state_info["reason"] = cs.state.waiting.reason
-                    state_info["message"] = cs.state.waiting.message
-                elif hasattr(cs.state, "terminated") and cs.state.terminated:
-                    state_info["current"] = "terminated"
-                    state_info["exit_code"] = cs.state.terminated.exit_code
-                    state_info["reason"] = cs.state.terminated.reason
-                    state_info["message"] = cs.state.terminated.message
-                    state_info["started_at"] = cs.state.terminated.started_at
-                    state_info["finished_at"] = cs.state.terminated.finished_at
-
-                container_status["state"] = state_info
-
-            status_info["container_statuses"].append(container_status)
+    for cs in status.get("containerStatuses") or []:
+        container_status = {
+            "name": cs.get("name"),
+            "ready": cs.get("ready"),
+            "restart_count": cs.get("restartCount"),
+            "image": cs.get("image"),
+            "image_id": cs.get("imageID"),
+            "container_id": cs.get("containerID")
+        }
+
+        state = cs.get("state")
+        if state is not None:
+            state_info = {}
+            if state.get("running"):
+                state_info["current"] = "running"
+                state_info["started_at"] = state["running"].get("startedAt")
+            elif state.get("waiting"):
+                state_info["current"] = "waiting"
+                state_info["reason"] = state["waiting"].get("reason")
+                state_info["message"] = state["waiting"].get("message")
+            elif state.get("terminated"):
+                terminated = state["terminated"]
+                state_info["current"] = "terminated"
+                state_info["exit_code"] = terminated.get("exitCode")
+                state_info["reason"] = terminated.get("reason")
+                state_info["message"] = terminated.get("message")
+                state_info["started_at"] = terminated.get("startedAt")
+                state_info["finished_at"] = terminated.get("finishedAt")
+
+            container_status["state"] = state_info
+
+        status_info["container_statuses"].append(container_status)
 
     result = {
-        "name": pod.metadata.name,
-        "namespace": pod.metadata.namespace,
+        "name": metadata.get("name"),
+        "namespace": metadata.get("namespace"),
         "status": status_info,
         "spec": {
             "containers": containers,
             "volumes": volumes,
-            "restart_policy": pod.spec.restart_policy,
-            "service_account": pod.spec.service_account,
-            "dns_policy": pod.spec.dns_policy,
-            "node_selector": pod.spec.node_selector or {},
+            "restart_policy": spec.get("restartPolicy"),
+            "service_account": spec.get("serviceAccount"),
+            "dns_policy": spec.get("dnsPolicy"),
+            "node_selector": spec.get("nodeSelector") or {},
             "tolerations": [{
-                "key": t.key,
-                "operator": t.operator,
-                "effect": t.effect,
-                "toleration_seconds": t.toleration_seconds
-            } for t in (pod.spec.tolerations or [])]
+                "key": t.get("key"),
+                "operator": t.get("operator"),
+                "effect": t.get("effect"),
+                "toleration_seconds": t.get("tolerationSeconds")
+            } for t in (spec.get("tolerations") or [])]
         },
-        "metadata": metadata,
+        "metadata": pod_metadata,
         "networking": networking,
         "conditions": conditions
     }
@@ -174,8 +233,10 @@ def pod_detail(context_name: str, namespace: str, name: str):
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pod_create(context_name: str, namespace: str, name: str, image: str,
                labels: Optional[Dict[str, str]] = None,
                command: Optional[List[str]] = None,
@@ -231,6 +292,7 @@ def pod_create(context_name: str, namespace: str, name: str, image: str,
 
     # Create the pod in Kubernetes
     created_pod = core_v1.create_namespaced_pod(namespace=namespace, body=pod)
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/pods", created_pod.metadata.resource_version)
 
     result = {
         "name": created_pod.metadata.name,
@@ -241,8 +303,10 @@ def pod_create(context_name: str, namespace: str, name: str, image: str,
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pod_update(context_name: str, namespace: str, name: str,
                labels: Optional[Dict[str, str]] = None):
     """
@@ -259,19 +323,13 @@ def pod_update(context_name: str, namespace: str, name: str,
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
-    # Get the current pod
-    pod = core_v1.read_namespaced_pod(name=name, namespace=namespace)
-
-    # Update pod labels if provided
-    if labels:
-        pod.metadata.labels = labels
-
     # Update the pod in Kubernetes
     updated_pod = core_v1.patch_namespaced_pod(
         name=name,
         namespace=namespace,
         body={"metadata": {"labels": labels}}
     )
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/pods", updated_pod.metadata.resource_version)
 
     result = {
         "name": updated_pod.metadata.name,
@@ -283,9 +341,11 @@ def pod_update(context_name: str, namespace: str, name: str,
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def pod_delete(context_name: str, namespace: str, name: str):
+@invalidates_cache
+def pod_delete(context_name: str, namespace: str, name: str, grace_period_seconds: Optional[int] = None):
     """
     Delete a pod from the specified namespace.
 
@@ -293,48 +353,46 @@ def pod_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The pod name to delete
+        grace_period_seconds: Optional termination grace period; the pod's own setting is used if omitted
 
     Returns:
         Status of the deletion operation
     """
+    from kubernetes.client import V1DeleteOptions
+    from kubernetes.client.rest import ApiException
+
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
     try:
-        # Delete the pod
-        api_response = core_v1.delete_namespaced_pod(
+        # Delete the pod; dependents are garbage collected in the background
+        core_v1.delete_namespaced_pod(
             name=name,
             namespace=namespace,
-            body={}  # Default deletion options
+            body=V1DeleteOptions(propagation_policy="Background", grace_period_seconds=grace_period_seconds)
         )
-
-        # Check if the response indicates success
-        if api_response.status == "Success":
-            return {
-                "name": name,
-                "namespace": namespace,
-                "status": "Deleted",
-                "message": f"Pod {name} deleted successfully"
-            }
-        else:
-            return {
-                "name": name,
-                "namespace": namespace,
-                "status": "Failed",
-                "message": f"Failed to delete pod {name}: {api_response.status}"
-            }
-    except Exception as e:
+    except ApiException as e:
         return {
             "name": name,
             "namespace": namespace,
             "status": "Error",
             "message": f"An error occurred while deleting pod {name}: {str(e)}"
         }
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/pods")
+
+    return {
+        "name": name,
+        "namespace": namespace,
+        "status": "Deleted",
+        "message": f"Pod {name} deleted successfully"
+    }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 def pod_logs(context_name: str, namespace: str, name: str, container: str = None,
-             tail_lines: int = 100, previous: bool = False):
+             tail_lines: Optional[int] = None, previous: bool = False, max_bytes: int = POD_LOGS_MAX_BYTES,
+             since_seconds: Optional[int] = None):
     """
     Get logs from a pod or a specific container within the pod.
 
@@ -343,26 +401,68 @@ def pod_logs(context_name: str, namespace: str, name: str, container: str = None
         namespace: The Kubernetes namespace
         name: The pod name
         container: Optional container name (if pod has multiple containers)
-        tail_lines: Number of lines to retrieve from the end of the logs
+        tail_lines: Optional number of lines to retrieve from the end of the logs. The kubelet
+            scans the log file backwards to find them, so prefer since_seconds for recent logs.
         previous: Whether to get logs from a previous instance of the container
+        max_bytes: Maximum number of log bytes to return. Without tail_lines the kubelet stops
+            reading after the first max_bytes; with it, the most recent max_bytes of the tail
+            are kept.
+        since_seconds: Optional limit to the logs of the last N seconds
 
     Returns:
         Pod logs
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
 
-    logs = core_v1.read_namespaced_pod_log(
+    response = core_v1.read_namespaced_pod_log(
         name=name,
         namespace=namespace,
         container=container,
-        tail_lines=tail_lines,
-        previous=previous
+        tail_lines=tail_lines or None,
+        previous=previous,
+        since_seconds=since_seconds,
+        # The kubelet applies limitBytes from the start of the tail window, which would drop
+        # the newest lines, so a tail is read in full and cut down below. One extra byte
+        # tells a log that is exactly max_bytes long from a truncated one.
+        limit_bytes=None if tail_lines else max_bytes + 1,
+        _preload_content=False
     )
 
+    buffer = bytearray()
+    truncated = False
+    unread = False
+    try:
+        for chunk in response.stream(POD_LOGS_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) <= max_bytes:
+                continue
+            truncated = True
+            if tail_lines:
+                # Keep the end of the tail
+                del buffer[:len(buffer) - max_bytes]
+            else:
+                # Cut at the last complete line that fits
+                cut = buffer.rfind(b"\n", 0, max_bytes + 1)
+                del buffer[cut + 1 if cut != -1 else max_bytes:]
+                unread = True
+                break
+    finally:
+        if unread:
+            # Unread data is left on the socket, so it cannot go back to the pool
+            response.close()
+        response.release_conn()
+
+    if truncated and tail_lines:
+        # Start at the first complete line that was kept
+        start = buffer.find(b"\n")
+        if start != -1:
+            del buffer[:start + 1]
+
     result = {
         "name": name,
         "namespace": namespace,
         "container": container,
-        "logs": logs
+        "logs": buffer.decode("utf-8", errors="replace"),
+        "truncated": truncated
     }
     return result
@@ -1,12 +1,21 @@
-from kubernetes.client import CoreV1Api, V1PersistentVolume, V1ObjectMeta, V1PersistentVolumeSpec
+from typing import TYPE_CHECKING
+
+from core.cache import invalidates_cache, ttl_cache
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
 from core.kubeconfig import get_api_clients
+from core.listing import iter_raw_items
 from server.server import mcp
 from core.permissions import check_readonly_permission
 
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
+@ttl_cache
 def pv_list(context_name: str):
     """
     List all PersistentVolumes in the cluster.
@@ -18,14 +27,17 @@ def pv_list(context_name: str):
         List of PersistentVolume basic information
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    pvs = core_v1.list_persistent_volume()
-    result = [{"name": pv.metadata.name, "capacity": pv.spec.capacity, "access_modes": pv.spec.access_modes} for pv in pvs.items]
+    pvs = iter_raw_items(core_v1.list_persistent_volume)
+    result = [{"name": pv["metadata"]["name"], "capacity": pv["spec"].get("capacity"),
+               "access_modes": pv["spec"].get("accessModes")} for pv in pvs]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pv_create(context_name: str, name: str, capacity: str, access_modes: list, storage_class: str, host_path: str):
     """
     Create a PersistentVolume in the cluster.
@@ -41,6 +53,8 @@ def pv_create(context_name: str, name: str, capacity: str, access_modes: list, s
     Returns:
         Status of the creation operation
     """
+    from kubernetes.client import V1PersistentVolume, V1ObjectMeta, V1PersistentVolumeSpec
+
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
     pv = V1PersistentVolume(
         metadata=V1ObjectMeta(name=name),
@@ -56,6 +70,7 @@ def pv_create(context_name: str, name: str, capacity: str, access_modes: list, s
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 def pv_get(context_name: str, name: str):
     """
@@ -80,8 +95,10 @@ def pv_get(context_name: str, name: str):
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pv_update(context_name: str, name: str, labels: dict):
     """
     Update an existing PersistentVolume's metadata (e.g., labels).
@@ -95,15 +112,15 @@ def pv_update(context_name: str, name: str, labels: dict):
         Status of the update operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    pv = core_v1.read_persistent_volume(name=name)
-    pv.metadata.labels = labels
     updated_pv = core_v1.patch_persistent_volume(name=name, body={"metadata": {"labels": labels}})
     return {"name": updated_pv.metadata.name, "status": "Updated", "labels": updated_pv.metadata.labels}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pv_delete(context_name: str, name: str):
     """
     Delete a PersistentVolume from the cluster.
@@ -1,32 +1,48 @@
-from kubernetes.client import CoreV1Api, V1PersistentVolumeClaim, V1ObjectMeta, V1PersistentVolumeClaimSpec, V1ResourceRequirements
+from typing import Optional, TYPE_CHECKING
+
+from core.cache import invalidates_cache, ttl_cache
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
 from core.kubeconfig import get_api_clients
+from core.listing import iter_raw_items
 from server.server import mcp
 from core.permissions import check_readonly_permission
 
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def pvc_list(context_name: str, namespace: str):
+@ttl_cache
+def pvc_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+             field_selector: Optional[str] = None):
     """
     List all PersistentVolumeClaims in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter claims server-side (e.g., "app=db")
+        field_selector: Optional field selector to filter claims server-side (e.g., "metadata.name=data")
 
     Returns:
         List of PersistentVolumeClaim basic information
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    pvcs = core_v1.list_namespaced_persistent_volume_claim(namespace)
-    result = [{"name": pvc.metadata.name, "status": pvc.status.phase, "storage": pvc.spec.resources.requests.get("storage")} for pvc in pvcs.items]
+    pvcs = iter_raw_items(core_v1.list_namespaced_persistent_volume_claim, namespace,
+                          label_selector=label_selector, field_selector=field_selector)
+    result = [{"name": pvc["metadata"]["name"], "status": pvc.get("status", {}).get("phase"),
+               "storage": pvc["spec"]["resources"]["requests"].get("storage")} for pvc in pvcs]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pvc_create(context_name: str, namespace: str, name: str, storage: str, access_modes: list, storage_class: str = None):
     """
     Create a PersistentVolumeClaim in the specified namespace.
@@ -42,6 +58,9 @@ def pvc_create(context_name: str, namespace: str, name: str, storage: str, acces
     Returns:
         Status of the creation operation
     """
+    from kubernetes.client import V1PersistentVolumeClaim, V1ObjectMeta, V1PersistentVolumeClaimSpec, \
+        V1ResourceRequirements
+
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
     pvc = V1PersistentVolumeClaim(
         metadata=V1ObjectMeta(name=name),
@@ -56,6 +75,7 @@ def pvc_create(context_name: str, namespace: str, name: str, storage: str, acces
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 def pvc_get(context_name: str, namespace: str, name: str):
     """
@@ -81,8 +101,10 @@ def pvc_get(context_name: str, namespace: str, name: str):
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pvc_update(context_name: str, namespace: str, name: str, labels: dict):
     """
     Update an existing PersistentVolumeClaim's metadata (e.g., labels).
@@ -97,15 +119,15 @@ def pvc_update(context_name: str, namespace: str, name: str, labels: dict):
         Status of the update operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    pvc = core_v1.read_namespaced_persistent_volume_claim(name=name, namespace=namespace)
-    pvc.metadata.labels = labels
     updated_pvc = core_v1.patch_namespaced_persistent_volume_claim(name=name, namespace=namespace, body={"metadata": {"labels": labels}})
     return {"name": updated_pvc.metadata.name, "status": "Updated", "labels": updated_pvc.metadata.labels}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
+@invalidates_cache
 def pvc_delete(context_name: str, namespace: str, name: str):
     """
     Delete a PersistentVolumeClaim from the specified namespace.
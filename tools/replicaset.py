@@ -1,33 +1,65 @@
-from kubernetes.client import AppsV1Api, V1ReplicaSet, V1ObjectMeta, V1PodTemplateSpec, V1PodSpec, V1Container, V1LabelSelector
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
 from core.permissions import check_readonly_permission
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import iter_raw_items, list_page, read_raw_object, selector_query
+from core.watch_cache import await_write, cached_objects
 from server.server import mcp
 
+if TYPE_CHECKING:
+    from kubernetes.client import AppsV1Api
+
+
+def _summary(obj: dict) -> dict:
+    return {"name": obj["metadata"]["name"], "replicas": (obj.get("status") or {}).get("replicas")}
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def replicaset_list(context_name: str, namespace: str):
+def replicaset_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                    field_selector: Optional[str] = None, limit: Optional[int] = None,
+                    continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all ReplicaSets in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter ReplicaSets server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter ReplicaSets server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of ReplicaSet basic information
     """
-    apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    replicasets = apps_v1.list_namespaced_replica_set(namespace)
-    result = [{"name": rs.metadata.name, "replicas": rs.status.replicas} for rs in replicasets.items]
+    path = f"/apis/apps/v1/namespaces/{namespace}/replicasets"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(get_api_clients(context_name)["api_client"], path, limit, continue_token,
+                                 request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [_summary(item) for item in items], "continue": token}
+
+    # The cache holds the whole collection, so only unfiltered lists are served from it
+    replicasets = None if selectors else cached_objects(context_name, path)
+    if replicasets is None:
+        apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
+        replicasets = iter_raw_items(apps_v1.list_namespaced_replica_set, namespace, label_selector=label_selector,
+                                     field_selector=field_selector, _request_timeout=request_timeout(timeout))
+    result = [_summary(rs) for rs in replicasets]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def replicaset_create(context_name: str, namespace: str, name: str, image: str, replicas: int, labels: dict):
+def replicaset_create(context_name: str, namespace: str, name: str, image: str, replicas: int, labels: dict,
+                      timeout: Optional[float] = None):
     """
     Create a ReplicaSet in the specified namespace.
 
@@ -38,29 +70,35 @@ def replicaset_create(context_name: str, namespace: str, name: str, image: str,
         image: The container image to use
         replicas: Number of replicas
         labels: Labels to apply to the ReplicaSet
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    replicaset = V1ReplicaSet(
-        metadata=V1ObjectMeta(name=name, labels=labels),
-        spec={
+    # Plain dict in API form: the client sends it as-is, without building models
+    replicaset = {
+        "metadata": {"name": name, "labels": labels},
+        "spec": {
             "replicas": replicas,
-            "selector": V1LabelSelector(match_labels=labels),
-            "template": V1PodTemplateSpec(
-                metadata=V1ObjectMeta(labels=labels),
-                spec=V1PodSpec(containers=[V1Container(name=name, image=image)])
-            )
+            "selector": {"matchLabels": labels},
+            "template": {
+                "metadata": {"labels": labels},
+                "spec": {"containers": [{"name": name, "image": image}]}
+            }
         }
-    )
-    created_replicaset = apps_v1.create_namespaced_replica_set(namespace=namespace, body=replicaset)
+    }
+    created_replicaset = apps_v1.create_namespaced_replica_set(namespace=namespace, body=replicaset,
+                                                               _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/apps/v1/namespaces/{namespace}/replicasets",
+                created_replicaset.metadata.resource_version)
     return {"name": created_replicaset.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def replicaset_get(context_name: str, namespace: str, name: str):
+def replicaset_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific ReplicaSet.
 
@@ -68,24 +106,28 @@ def replicaset_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The ReplicaSet name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the ReplicaSet
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    replicaset = apps_v1.read_namespaced_replica_set(name=name, namespace=namespace)
+    replicaset = read_raw_object(apps_v1.read_namespaced_replica_set, name=name, namespace=namespace,
+                                 _request_timeout=request_timeout(timeout))
     return {
-        "name": replicaset.metadata.name,
-        "replicas": replicaset.status.replicas,
-        "labels": replicaset.metadata.labels,
-        "containers": [c.image for c in replicaset.spec.template.spec.containers]
+        "name": replicaset["metadata"]["name"],
+        "replicas": (replicaset.get("status") or {}).get("replicas"),
+        "labels": replicaset["metadata"].get("labels"),
+        "containers": [c.get("image") for c in replicaset["spec"]["template"]["spec"]["containers"]]
     }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def replicaset_update(context_name: str, namespace: str, name: str, image: str, replicas: int):
+def replicaset_update(context_name: str, namespace: str, name: str, image: str, replicas: int,
+                      timeout: Optional[float] = None):
     """
     Update an existing ReplicaSet in the specified namespace.
 
@@ -95,22 +137,29 @@ def replicaset_update(context_name: str, namespace: str, name: str, image: str,
         name: The ReplicaSet name
         image: The new container image to update
         replicas: The new number of replicas
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    replicaset = apps_v1.read_namespaced_replica_set(name=name, namespace=namespace)
-    replicaset.spec.template.spec.containers[0].image = image
-    replicaset.spec.replicas = replicas
-    updated_replicaset = apps_v1.replace_namespaced_replica_set(name=name, namespace=namespace, body=replicaset)
+    # Patch the first container by index so no read is needed to learn its name
+    body = [
+        {"op": "replace", "path": "/spec/template/spec/containers/0/image", "value": image},
+        {"op": "add", "path": "/spec/replicas", "value": replicas},
+    ]
+    updated_replicaset = apps_v1.patch_namespaced_replica_set(name=name, namespace=namespace, body=body,
+                                                              _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/apps/v1/namespaces/{namespace}/replicasets",
+                updated_replicaset.metadata.resource_version)
     return {"name": updated_replicaset.metadata.name, "status": "Updated"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def replicaset_delete(context_name: str, namespace: str, name: str):
+def replicaset_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a ReplicaSet from the specified namespace.
 
@@ -118,10 +167,14 @@ def replicaset_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The ReplicaSet name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    apps_v1.delete_namespaced_replica_set(name=name, namespace=namespace)
+    # Returns once the object is marked for deletion; dependents are garbage collected in the background
+    apps_v1.delete_namespaced_replica_set(name=name, namespace=namespace, propagation_policy="Background",
+                                          _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/apps/v1/namespaces/{namespace}/replicasets")
     return {"name": name, "status": "Deleted"}
\ No newline at end of file
@@ -1,33 +1,72 @@
-from kubernetes.client import RbacAuthorizationV1Api, V1Role, V1ClusterRole, V1ObjectMeta, V1PolicyRule
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import list_object_names, list_page, read_raw_object, selector_query
+from core.watch_cache import await_write, cached_objects
 from server.server import mcp
 from core.permissions import check_readonly_permission
 
+if TYPE_CHECKING:
+    from kubernetes.client import RbacAuthorizationV1Api
+
+
+# snake_case PolicyRule keys accepted by the create tools -> API field names
+_RULE_FIELDS = {"api_groups": "apiGroups", "resource_names": "resourceNames", "non_resource_urls": "nonResourceURLs"}
+
+
+def _rule_to_dict(rule: dict) -> dict:
+    return {"api_groups": rule.get("apiGroups"), "resources": rule.get("resources"), "verbs": rule.get("verbs")}
+
+
+def _rule_body(rule: dict) -> dict:
+    return {_RULE_FIELDS.get(key, key): value for key, value in rule.items()}
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def role_list(context_name: str, namespace: str):
+def role_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+              field_selector: Optional[str] = None, limit: Optional[int] = None,
+              continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all Roles in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter Roles server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter Roles server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of Role basic information
     """
-    rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    roles = rbac_v1.list_namespaced_role(namespace)
-    result = [{"name": role.metadata.name} for role in roles.items]
+    path = f"/apis/rbac.authorization.k8s.io/v1/namespaces/{namespace}/roles"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(get_api_clients(context_name)["api_client"], path, limit, continue_token,
+                                 metadata_only=True, request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    # The cache holds the whole collection, so only unfiltered lists are served from it
+    roles = None if selectors else cached_objects(context_name, path)
+    if roles is None:
+        result = list_object_names(get_api_clients(context_name)["api_client"], path,
+                                   request_timeout=request_timeout(timeout), **selectors)
+    else:
+        result = [{"name": role["metadata"]["name"]} for role in roles]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def role_create(context_name: str, namespace: str, name: str, rules: list):
+def role_create(context_name: str, namespace: str, name: str, rules: list, timeout: Optional[float] = None):
     """
     Create a Role in the specified namespace.
 
@@ -36,22 +75,24 @@ def role_create(context_name: str, namespace: str, name: str, rules: list):
         namespace: The Kubernetes namespace
         name: The Role name
         rules: List of policy rules
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
     rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    role = V1Role(
-        metadata=V1ObjectMeta(name=name),
-        rules=[V1PolicyRule(**rule) for rule in rules]
-    )
-    created_role = rbac_v1.create_namespaced_role(namespace=namespace, body=role)
+    role = {"metadata": {"name": name}, "rules": [_rule_body(rule) for rule in rules]}
+    created_role = rbac_v1.create_namespaced_role(namespace=namespace, body=role,
+                                                  _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/rbac.authorization.k8s.io/v1/namespaces/{namespace}/roles",
+                created_role.metadata.resource_version)
     return {"name": created_role.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def role_get(context_name: str, namespace: str, name: str):
+def role_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific Role.
 
@@ -59,22 +100,25 @@ def role_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Role name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the Role
     """
     rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    role = rbac_v1.read_namespaced_role(name=name, namespace=namespace)
+    role = read_raw_object(rbac_v1.read_namespaced_role, name=name, namespace=namespace,
+                           _request_timeout=request_timeout(timeout))
     return {
-        "name": role.metadata.name,
-        "rules": [{"api_groups": rule.api_groups, "resources": rule.resources, "verbs": rule.verbs} for rule in role.rules]
+        "name": role["metadata"]["name"],
+        "rules": [_rule_to_dict(rule) for rule in role.get("rules") or []]
     }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def role_delete(context_name: str, namespace: str, name: str):
+def role_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a Role from the specified namespace.
 
@@ -82,37 +126,60 @@ def role_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Role name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    rbac_v1.delete_namespaced_role(name=name, namespace=namespace)
+    rbac_v1.delete_namespaced_role(name=name, namespace=namespace, propagation_policy="Background",
+                                   _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/rbac.authorization.k8s.io/v1/namespaces/{namespace}/roles")
     return {"name": name, "status": "Deleted"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def clusterrole_list(context_name: str):
+def clusterrole_list(context_name: str, label_selector: Optional[str] = None,
+                     field_selector: Optional[str] = None, limit: Optional[int] = None,
+                     continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all ClusterRoles in the cluster.
 
     Args:
         context_name: The Kubernetes context name
+        label_selector: Optional label selector to filter ClusterRoles server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter ClusterRoles server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of ClusterRole basic information
     """
-    rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    clusterroles = rbac_v1.list_cluster_role()
-    result = [{"name": clusterrole.metadata.name} for clusterrole in clusterroles.items]
+    path = "/apis/rbac.authorization.k8s.io/v1/clusterroles"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(get_api_clients(context_name)["api_client"], path, limit, continue_token,
+                                 metadata_only=True, request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    # The cache holds the whole collection, so only unfiltered lists are served from it
+    clusterroles = None if selectors else cached_objects(context_name, path)
+    if clusterroles is None:
+        result = list_object_names(get_api_clients(context_name)["api_client"], path,
+                                   request_timeout=request_timeout(timeout), **selectors)
+    else:
+        result = [{"name": clusterrole["metadata"]["name"]} for clusterrole in clusterroles]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def clusterrole_create(context_name: str, name: str, rules: list):
+def clusterrole_create(context_name: str, name: str, rules: list, timeout: Optional[float] = None):
     """
     Create a ClusterRole in the cluster.
 
@@ -120,54 +187,60 @@ def clusterrole_create(context_name: str, name: str, rules: list):
         context_name: The Kubernetes context name
         name: The ClusterRole name
         rules: List of policy rules
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
     rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    clusterrole = V1ClusterRole(
-        metadata=V1ObjectMeta(name=name),
-        rules=[V1PolicyRule(**rule) for rule in rules]
-    )
-    created_clusterrole = rbac_v1.create_cluster_role(body=clusterrole)
+    clusterrole = {"metadata": {"name": name}, "rules": [_rule_body(rule) for rule in rules]}
+    created_clusterrole = rbac_v1.create_cluster_role(body=clusterrole, _request_timeout=request_timeout(timeout))
+    await_write(context_name, "/apis/rbac.authorization.k8s.io/v1/clusterroles",
+                created_clusterrole.metadata.resource_version)
     return {"name": created_clusterrole.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def clusterrole_get(context_name: str, name: str):
+def clusterrole_get(context_name: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific ClusterRole.
 
     Args:
         context_name: The Kubernetes context name
         name: The ClusterRole name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the ClusterRole
     """
     rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    clusterrole = rbac_v1.read_cluster_role(name=name)
+    clusterrole = read_raw_object(rbac_v1.read_cluster_role, name=name, _request_timeout=request_timeout(timeout))
     return {
-        "name": clusterrole.metadata.name,
-        "rules": [{"api_groups": rule.api_groups, "resources": rule.resources, "verbs": rule.verbs} for rule in clusterrole.rules]
+        "name": clusterrole["metadata"]["name"],
+        "rules": [_rule_to_dict(rule) for rule in clusterrole.get("rules") or []]
     }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def clusterrole_delete(context_name: str, name: str):
+def clusterrole_delete(context_name: str, name: str, timeout: Optional[float] = None):
     """
     Delete a ClusterRole from the cluster.
 
     Args:
         context_name: The Kubernetes context name
         name: The ClusterRole name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     rbac_v1: RbacAuthorizationV1Api = get_api_clients(context_name)["rbac"]
-    rbac_v1.delete_cluster_role(name=name)
+    rbac_v1.delete_cluster_role(name=name, propagation_policy="Background",
+                                _request_timeout=request_timeout(timeout))
+    await_write(context_name, "/apis/rbac.authorization.k8s.io/v1/clusterroles")
     return {"name": name, "status": "Deleted"}
\ No newline at end of file
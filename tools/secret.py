@@ -1,34 +1,96 @@
-from kubernetes.client import CoreV1Api, V1Secret, V1ObjectMeta
+from binascii import a2b_base64, b2a_base64
+from functools import partial
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from core.concurrency import run_per_item, runs_in_thread
 from core.context import use_current_context
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import list_object_names, list_page, read_raw_object, selector_query
+from core.watch_cache import await_write, cached_objects
 from server.server import mcp
 from core.permissions import check_readonly_permission
-import base64
+
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
+
+
+def _encode_data(data: Dict[str, str]) -> Dict[str, str]:
+    return {key: b2a_base64(value.encode(), newline=False).decode("ascii") for key, value in data.items()}
+
+
+def _decode_data(data: Dict[str, str]) -> Dict[str, str]:
+    return {key: a2b_base64(value).decode() for key, value in data.items()}
+
+
+def _decoded_sizes(data: Dict[str, str]) -> Dict[str, int]:
+    # Size of each decoded value, computed from the base64 length without decoding it
+    return {key: len(value) * 3 // 4 - value.count("=", -2) for key, value in data.items()}
+
+
+def _get_secret(context_name: str, namespace: str, name: str, reveal: bool = False,
+                timeout: Optional[float] = None):
+    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
+    secret = read_raw_object(core_v1.read_namespaced_secret, name=name, namespace=namespace,
+                             _request_timeout=request_timeout(timeout))
+    if not reveal:
+        return {
+            "name": secret["metadata"]["name"],
+            "type": secret.get("type"),
+            "data_sizes": _decoded_sizes(secret.get("data") or {})
+        }
+    decoded_data = _decode_data(secret.get("data") or {})
+    return {
+        "name": secret["metadata"]["name"],
+        "type": secret.get("type"),
+        "data": decoded_data
+    }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def secret_list(context_name: str, namespace: str):
+def secret_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                field_selector: Optional[str] = None, limit: Optional[int] = None,
+                continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all Secrets in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter Secrets server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter Secrets server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
-        List of Secret basic information
+        List of Secret names; secret_get returns the type and data sizes of one
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    secrets = core_v1.list_namespaced_secret(namespace)
-    result = [{"name": secret.metadata.name, "type": secret.type} for secret in secrets.items]
+    # Only object metadata is requested, so Secret values are never transferred or cached
+    path = f"/api/v1/namespaces/{namespace}/secrets"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(get_api_clients(context_name)["api_client"], path, limit, continue_token,
+                                 metadata_only=True, request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    # The cache holds the whole collection, so only unfiltered lists are served from it
+    secrets = None if selectors else cached_objects(context_name, path, metadata_only=True)
+    if secrets is None:
+        result = list_object_names(get_api_clients(context_name)["api_client"], path,
+                                   request_timeout=request_timeout(timeout), **selectors)
+    else:
+        result = [{"name": secret["metadata"]["name"]} for secret in secrets]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def secret_create(context_name: str, namespace: str, name: str, data: dict, secret_type: str = "Opaque"):
+def secret_create(context_name: str, namespace: str, name: str, data: dict, secret_type: str = "Opaque",
+                  timeout: Optional[float] = None):
     """
     Create a Secret in the specified namespace.
 
@@ -38,24 +100,24 @@ def secret_create(context_name: str, namespace: str, name: str, data: dict, secr
         name: The Secret name
         data: A dictionary of key-value pairs (values will be base64 encoded)
         secret_type: The type of the Secret (default is "Opaque")
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    encoded_data = {key: base64.b64encode(value.encode()).decode() for key, value in data.items()}
-    secret = V1Secret(
-        metadata=V1ObjectMeta(name=name),
-        data=encoded_data,
-        type=secret_type
-    )
-    created_secret = core_v1.create_namespaced_secret(namespace=namespace, body=secret)
+    encoded_data = _encode_data(data)
+    secret = {"metadata": {"name": name}, "data": encoded_data, "type": secret_type}
+    created_secret = core_v1.create_namespaced_secret(namespace=namespace, body=secret,
+                                                      _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/secrets", created_secret.metadata.resource_version)
     return {"name": created_secret.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def secret_get(context_name: str, namespace: str, name: str):
+def secret_get(context_name: str, namespace: str, name: str, reveal: bool = False, timeout: Optional[float] = None):
     """
     Get details of a specific Secret.
 
@@ -63,24 +125,41 @@ def secret_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Secret name
+        reveal: Whether to return the decoded values; otherwise only the size of each value is returned
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the Secret
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    secret = core_v1.read_namespaced_secret(name=name, namespace=namespace)
-    decoded_data = {key: base64.b64decode(value).decode() for key, value in secret.data.items()}
-    return {
-        "name": secret.metadata.name,
-        "type": secret.type,
-        "data": decoded_data
-    }
+    return _get_secret(context_name, namespace, name, reveal=reveal, timeout=timeout)
+
+
+@mcp.tool()
+@runs_in_thread
+@use_current_context
+def secret_get_many(context_name: str, namespace: str, names: List[str], reveal: bool = False,
+                    timeout: Optional[float] = None):
+    """
+    Get details of several Secrets of a namespace at once.
+
+    Args:
+        context_name: The Kubernetes context name
+        namespace: The Kubernetes namespace
+        names: The Secret names
+        reveal: Whether to return the decoded values; otherwise only the size of each value is returned
+        timeout: Optional read timeout in seconds of each API request (default 30)
+
+    Returns:
+        A mapping of Secret name to its details, or to an error for that Secret
+    """
+    return run_per_item(partial(_get_secret, context_name, namespace, reveal=reveal, timeout=timeout), names)
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def secret_update(context_name: str, namespace: str, name: str, data: dict):
+def secret_update(context_name: str, namespace: str, name: str, data: dict, timeout: Optional[float] = None):
     """
     Update an existing Secret in the specified namespace.
 
@@ -89,22 +168,25 @@ def secret_update(context_name: str, namespace: str, name: str, data: dict):
         namespace: The Kubernetes namespace
         name: The Secret name
         data: A dictionary of key-value pairs (values will be base64 encoded)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    secret = core_v1.read_namespaced_secret(name=name, namespace=namespace)
-    encoded_data = {key: base64.b64encode(value.encode()).decode() for key, value in data.items()}
-    secret.data.update(encoded_data)
-    updated_secret = core_v1.replace_namespaced_secret(name=name, namespace=namespace, body=secret)
+    encoded_data = _encode_data(data)
+    # Strategic merge: the given keys are added or replaced, the others are kept
+    updated_secret = core_v1.patch_namespaced_secret(name=name, namespace=namespace, body={"data": encoded_data},
+                                                     _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/secrets", updated_secret.metadata.resource_version)
     return {"name": updated_secret.metadata.name, "status": "Updated"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def secret_delete(context_name: str, namespace: str, name: str):
+def secret_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a Secret from the specified namespace.
 
@@ -112,10 +194,13 @@ def secret_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Secret name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    core_v1.delete_namespaced_secret(name=name, namespace=namespace)
+    core_v1.delete_namespaced_secret(name=name, namespace=namespace, propagation_policy="Background",
+                                     _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/secrets")
     return {"name": name, "status": "Deleted"}
\ No newline at end of file
@@ -1,33 +1,91 @@
-from kubernetes.client import CoreV1Api, V1Service, V1ObjectMeta, V1ServiceSpec, V1ServicePort
+from functools import partial
+from typing import List, Optional, TYPE_CHECKING
+
+from core.concurrency import run_per_item, runs_in_thread
 from core.context import use_current_context
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import iter_raw_items, list_page, read_raw_object, selector_query
+from core.watch_cache import await_write, cached_objects
 from server.server import mcp
 from core.permissions import check_readonly_permission
 
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
+
+
+def _summary(svc: dict) -> dict:
+    return {"name": svc["metadata"]["name"], "type": svc["spec"].get("type"), "cluster_ip": svc["spec"].get("clusterIP")}
+
+
+def _list_services(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                   field_selector: Optional[str] = None, timeout: Optional[float] = None):
+    # The cache holds the whole collection, so only unfiltered lists are served from it
+    services = None
+    if not (label_selector or field_selector):
+        services = cached_objects(context_name, f"/api/v1/namespaces/{namespace}/services")
+    if services is None:
+        core_v1: CoreV1Api = get_api_clients(context_name)["core"]
+        services = iter_raw_items(core_v1.list_namespaced_service, namespace, label_selector=label_selector,
+                                  field_selector=field_selector, _request_timeout=request_timeout(timeout))
+    return [_summary(svc) for svc in services]
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def service_list(context_name: str, namespace: str):
+def service_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                 field_selector: Optional[str] = None, limit: Optional[int] = None,
+                 continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all Services in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter Services server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter Services server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of Service basic information
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    services = core_v1.list_namespaced_service(namespace)
-    result = [{"name": svc.metadata.name, "type": svc.spec.type, "cluster_ip": svc.spec.cluster_ip} for svc in services.items]
+    if limit:
+        path = f"/api/v1/namespaces/{namespace}/services"
+        items, token = list_page(get_api_clients(context_name)["api_client"], path, limit, continue_token,
+                                 request_timeout=request_timeout(timeout),
+                                 **selector_query(label_selector, field_selector))
+        return {"items": [_summary(item) for item in items], "continue": token}
+
+    result = _list_services(context_name, namespace, label_selector, field_selector, timeout)
     return result
 
 
 @mcp.tool()
+@runs_in_thread
+@use_current_context
+def service_list_many(context_name: str, namespaces: List[str], timeout: Optional[float] = None):
+    """
+    List the Services of several namespaces at once.
+
+    Args:
+        context_name: The Kubernetes context name
+        namespaces: The Kubernetes namespaces to query
+        timeout: Optional read timeout in seconds of each API request (default 30)
+
+    Returns:
+        A mapping of namespace to its Services, or to an error for that namespace
+    """
+    return run_per_item(partial(_list_services, context_name, timeout=timeout), namespaces)
+
+
+@mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def service_create(context_name: str, namespace: str, name: str, selector: dict, ports: list, service_type: str = "ClusterIP"):
+def service_create(context_name: str, namespace: str, name: str, selector: dict, ports: list, service_type: str = "ClusterIP",
+                   timeout: Optional[float] = None):
     """
     Create a Service in the specified namespace.
 
@@ -38,26 +96,30 @@ def service_create(context_name: str, namespace: str, name: str, selector: dict,
         selector: A dictionary of labels to select the target pods
         ports: A list of ports (e.g., [{"port": 80, "target_port": 8080}])
         service_type: The type of the Service (default is "ClusterIP")
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    service = V1Service(
-        metadata=V1ObjectMeta(name=name),
-        spec=V1ServiceSpec(
-            selector=selector,
-            ports=[V1ServicePort(port=port["port"], target_port=port["target_port"]) for port in ports],
-            type=service_type
-        )
-    )
-    created_service = core_v1.create_namespaced_service(namespace=namespace, body=service)
+    service = {
+        "metadata": {"name": name},
+        "spec": {
+            "selector": selector,
+            "ports": [{"port": port["port"], "targetPort": port["target_port"]} for port in ports],
+            "type": service_type
+        }
+    }
+    created_service = core_v1.create_namespaced_service(namespace=namespace, body=service,
+                                                        _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/services", created_service.metadata.resource_version)
     return {"name": created_service.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def service_get(context_name: str, namespace: str, name: str):
+def service_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific Service.
 
@@ -65,25 +127,29 @@ def service_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Service name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the Service
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    service = core_v1.read_namespaced_service(name=name, namespace=namespace)
+    service = read_raw_object(core_v1.read_namespaced_service, name=name, namespace=namespace,
+                              _request_timeout=request_timeout(timeout))
+    spec = service["spec"]
     return {
-        "name": service.metadata.name,
-        "type": service.spec.type,
-        "cluster_ip": service.spec.cluster_ip,
-        "ports": [{"port": port.port, "target_port": port.target_port} for port in service.spec.ports],
-        "selector": service.spec.selector
+        "name": service["metadata"]["name"],
+        "type": spec.get("type"),
+        "cluster_ip": spec.get("clusterIP"),
+        "ports": [{"port": port.get("port"), "target_port": port.get("targetPort")} for port in spec.get("ports") or []],
+        "selector": spec.get("selector")
     }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def service_update(context_name: str, namespace: str, name: str, labels: dict):
+def service_update(context_name: str, namespace: str, name: str, labels: dict, timeout: Optional[float] = None):
     """
     Update an existing Service's metadata (e.g., labels).
 
@@ -92,21 +158,23 @@ def service_update(context_name: str, namespace: str, name: str, labels: dict):
         namespace: The Kubernetes namespace
         name: The Service name
         labels: New labels to apply to the Service
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    service = core_v1.read_namespaced_service(name=name, namespace=namespace)
-    service.metadata.labels = labels
-    updated_service = core_v1.patch_namespaced_service(name=name, namespace=namespace, body={"metadata": {"labels": labels}})
+    updated_service = core_v1.patch_namespaced_service(name=name, namespace=namespace, body={"metadata": {"labels": labels}},
+                                                       _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/services", updated_service.metadata.resource_version)
     return {"name": updated_service.metadata.name, "status": "Updated", "labels": updated_service.metadata.labels}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def service_delete(context_name: str, namespace: str, name: str):
+def service_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a Service from the specified namespace.
 
@@ -114,10 +182,13 @@ def service_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The Service name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    core_v1.delete_namespaced_service(name=name, namespace=namespace)
+    core_v1.delete_namespaced_service(name=name, namespace=namespace, propagation_policy="Background",
+                                      _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/services")
     return {"name": name, "status": "Deleted"}
\ No newline at end of file
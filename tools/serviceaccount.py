@@ -1,33 +1,61 @@
-from kubernetes.client import CoreV1Api, V1ServiceAccount, V1ObjectMeta
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import list_object_names, list_page, read_raw_object, selector_query
+from core.watch_cache import await_write, cached_objects
 from server.server import mcp
 from core.permissions import check_readonly_permission
 
+if TYPE_CHECKING:
+    from kubernetes.client import CoreV1Api
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def serviceaccount_list(context_name: str, namespace: str):
+def serviceaccount_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                        field_selector: Optional[str] = None, limit: Optional[int] = None,
+                        continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all ServiceAccounts in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter ServiceAccounts server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter ServiceAccounts server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of ServiceAccount basic information
     """
-    core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    serviceaccounts = core_v1.list_namespaced_service_account(namespace)
-    result = [{"name": sa.metadata.name} for sa in serviceaccounts.items]
+    path = f"/api/v1/namespaces/{namespace}/serviceaccounts"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(get_api_clients(context_name)["api_client"], path, limit, continue_token,
+                                 metadata_only=True, request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [{"name": item["metadata"]["name"]} for item in items], "continue": token}
+
+    # The cache holds the whole collection, so only unfiltered lists are served from it
+    serviceaccounts = None if selectors else cached_objects(context_name, path)
+    if serviceaccounts is None:
+        result = list_object_names(get_api_clients(context_name)["api_client"], path,
+                                   request_timeout=request_timeout(timeout), **selectors)
+    else:
+        result = [{"name": sa["metadata"]["name"]} for sa in serviceaccounts]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def serviceaccount_create(context_name: str, namespace: str, name: str, labels: dict = None):
+def serviceaccount_create(context_name: str, namespace: str, name: str, labels: dict = None,
+                          timeout: Optional[float] = None):
     """
     Create a ServiceAccount in the specified namespace.
 
@@ -36,21 +64,24 @@ def serviceaccount_create(context_name: str, namespace: str, name: str, labels:
         namespace: The Kubernetes namespace
         name: The ServiceAccount name
         labels: Optional labels to apply to the ServiceAccount
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    serviceaccount = V1ServiceAccount(
-        metadata=V1ObjectMeta(name=name, labels=labels)
-    )
-    created_serviceaccount = core_v1.create_namespaced_service_account(namespace=namespace, body=serviceaccount)
+    serviceaccount = {"metadata": {"name": name, "labels": labels}}
+    created_serviceaccount = core_v1.create_namespaced_service_account(namespace=namespace, body=serviceaccount,
+                                                                       _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/serviceaccounts",
+                created_serviceaccount.metadata.resource_version)
     return {"name": created_serviceaccount.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def serviceaccount_get(context_name: str, namespace: str, name: str):
+def serviceaccount_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific ServiceAccount.
 
@@ -58,23 +89,26 @@ def serviceaccount_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The ServiceAccount name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the ServiceAccount
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    serviceaccount = core_v1.read_namespaced_service_account(name=name, namespace=namespace)
+    serviceaccount = read_raw_object(core_v1.read_namespaced_service_account, name=name, namespace=namespace,
+                                     _request_timeout=request_timeout(timeout))
     return {
-        "name": serviceaccount.metadata.name,
-        "labels": serviceaccount.metadata.labels,
-        "secrets": serviceaccount.secrets
+        "name": serviceaccount["metadata"]["name"],
+        "labels": serviceaccount["metadata"].get("labels"),
+        "secrets": serviceaccount.get("secrets")
     }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def serviceaccount_delete(context_name: str, namespace: str, name: str):
+def serviceaccount_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a ServiceAccount from the specified namespace.
 
@@ -82,10 +116,13 @@ def serviceaccount_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The ServiceAccount name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     core_v1: CoreV1Api = get_api_clients(context_name)["core"]
-    core_v1.delete_namespaced_service_account(name=name, namespace=namespace)
+    core_v1.delete_namespaced_service_account(name=name, namespace=namespace, propagation_policy="Background",
+                                              _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/api/v1/namespaces/{namespace}/serviceaccounts")
     return {"name": name, "status": "Deleted"}
\ No newline at end of file
@@ -1,33 +1,65 @@
-from kubernetes.client import AppsV1Api, V1StatefulSet, V1ObjectMeta, V1LabelSelector, V1PodTemplateSpec, V1PodSpec, V1Container, V1StatefulSetSpec
+from typing import Optional, TYPE_CHECKING
+
+from core.concurrency import runs_in_thread
 from core.context import use_current_context
 from core.permissions import check_readonly_permission
-from core.kubeconfig import get_api_clients
+from core.kubeconfig import get_api_clients, request_timeout
+from core.listing import iter_raw_items, list_page, read_raw_object, selector_query
+from core.watch_cache import await_write, cached_objects
 from server.server import mcp
 
+if TYPE_CHECKING:
+    from kubernetes.client import AppsV1Api
+
+
+def _summary(obj: dict) -> dict:
+    return {"name": obj["metadata"]["name"], "replicas": (obj.get("status") or {}).get("replicas")}
+
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def statefulset_list(context_name: str, namespace: str):
+def statefulset_list(context_name: str, namespace: str, label_selector: Optional[str] = None,
+                     field_selector: Optional[str] = None, limit: Optional[int] = None,
+                     continue_token: Optional[str] = None, timeout: Optional[float] = None):
     """
     List all StatefulSets in a given namespace.
 
     Args:
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
+        label_selector: Optional label selector to filter StatefulSets server-side (e.g., "app=nginx")
+        field_selector: Optional field selector to filter StatefulSets server-side (e.g., "metadata.name=nginx")
+        limit: Optional page size; when set, one page is returned as {"items": [...], "continue": token}
+        continue_token: The continue token of the previous page (used with limit)
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         List of StatefulSet basic information
     """
-    apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    statefulsets = apps_v1.list_namespaced_stateful_set(namespace)
-    result = [{"name": ss.metadata.name, "replicas": ss.status.replicas} for ss in statefulsets.items]
+    path = f"/apis/apps/v1/namespaces/{namespace}/statefulsets"
+    selectors = selector_query(label_selector, field_selector)
+    if limit:
+        items, token = list_page(get_api_clients(context_name)["api_client"], path, limit, continue_token,
+                                 request_timeout=request_timeout(timeout), **selectors)
+        return {"items": [_summary(item) for item in items], "continue": token}
+
+    # The cache holds the whole collection, so only unfiltered lists are served from it
+    statefulsets = None if selectors else cached_objects(context_name, path)
+    if statefulsets is None:
+        apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
+        statefulsets = iter_raw_items(apps_v1.list_namespaced_stateful_set, namespace, label_selector=label_selector,
+                                      field_selector=field_selector, _request_timeout=request_timeout(timeout))
+    result = [_summary(ss) for ss in statefulsets]
     return result
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def statefulset_create(context_name: str, namespace: str, name: str, image: str, replicas: int, labels: dict):
+def statefulset_create(context_name: str, namespace: str, name: str, image: str, replicas: int, labels: dict,
+                       timeout: Optional[float] = None):
     """
     Create a StatefulSet in the specified namespace.
 
@@ -38,30 +70,36 @@ def statefulset_create(context_name: str, namespace: str, name: str, image: str,
         image: The container image to use
         replicas: Number of replicas
         labels: Labels to apply to the StatefulSet
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the creation operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    statefulset = V1StatefulSet(
-        metadata=V1ObjectMeta(name=name, labels=labels),
-        spec=V1StatefulSetSpec(
-            replicas=replicas,
-            selector=V1LabelSelector(match_labels=labels),
-            service_name=name,
-            template=V1PodTemplateSpec(
-                metadata=V1ObjectMeta(labels=labels),
-                spec=V1PodSpec(containers=[V1Container(name=name, image=image)])
-            )
-        )
-    )
-    created_statefulset = apps_v1.create_namespaced_stateful_set(namespace=namespace, body=statefulset)
+    # Plain dict in API form: the client sends it as-is, without building models
+    statefulset = {
+        "metadata": {"name": name, "labels": labels},
+        "spec": {
+            "replicas": replicas,
+            "selector": {"matchLabels": labels},
+            "serviceName": name,
+            "template": {
+                "metadata": {"labels": labels},
+                "spec": {"containers": [{"name": name, "image": image}]}
+            }
+        }
+    }
+    created_statefulset = apps_v1.create_namespaced_stateful_set(namespace=namespace, body=statefulset,
+                                                                 _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/apps/v1/namespaces/{namespace}/statefulsets",
+                created_statefulset.metadata.resource_version)
     return {"name": created_statefulset.metadata.name, "status": "Created"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
-def statefulset_get(context_name: str, namespace: str, name: str):
+def statefulset_get(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Get details of a specific StatefulSet.
 
@@ -69,24 +107,28 @@ def statefulset_get(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The StatefulSet name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Detailed information about the StatefulSet
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    statefulset = apps_v1.read_namespaced_stateful_set(name=name, namespace=namespace)
+    statefulset = read_raw_object(apps_v1.read_namespaced_stateful_set, name=name, namespace=namespace,
+                                  _request_timeout=request_timeout(timeout))
     return {
-        "name": statefulset.metadata.name,
-        "replicas": statefulset.status.replicas,
-        "labels": statefulset.metadata.labels,
-        "containers": [c.image for c in statefulset.spec.template.spec.containers]
+        "name": statefulset["metadata"]["name"],
+        "replicas": (statefulset.get("status") or {}).get("replicas"),
+        "labels": statefulset["metadata"].get("labels"),
+        "containers": [c.get("image") for c in statefulset["spec"]["template"]["spec"]["containers"]]
     }
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def statefulset_update(context_name: str, namespace: str, name: str, image: str, replicas: int):
+def statefulset_update(context_name: str, namespace: str, name: str, image: str, replicas: int,
+                       timeout: Optional[float] = None):
     """
     Update an existing StatefulSet in the specified namespace.
 
@@ -96,22 +138,29 @@ def statefulset_update(context_name: str, namespace: str, name: str, image: str,
         name: The StatefulSet name
         image: The new container image to update
         replicas: The new number of replicas
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the update operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    statefulset = apps_v1.read_namespaced_stateful_set(name=name, namespace=namespace)
-    statefulset.spec.template.spec.containers[0].image = image
-    statefulset.spec.replicas = replicas
-    updated_statefulset = apps_v1.replace_namespaced_stateful_set(name=name, namespace=namespace, body=statefulset)
+    # Patch the first container by index so no read is needed to learn its name
+    body = [
+        {"op": "replace", "path": "/spec/template/spec/containers/0/image", "value": image},
+        {"op": "add", "path": "/spec/replicas", "value": replicas},
+    ]
+    updated_statefulset = apps_v1.patch_namespaced_stateful_set(name=name, namespace=namespace, body=body,
+                                                                _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/apps/v1/namespaces/{namespace}/statefulsets",
+                updated_statefulset.metadata.resource_version)
     return {"name": updated_statefulset.metadata.name, "status": "Updated"}
 
 
 @mcp.tool()
+@runs_in_thread
 @use_current_context
 @check_readonly_permission
-def statefulset_delete(context_name: str, namespace: str, name: str):
+def statefulset_delete(context_name: str, namespace: str, name: str, timeout: Optional[float] = None):
     """
     Delete a StatefulSet from the specified namespace.
 
@@ -119,10 +168,14 @@ def statefulset_delete(context_name: str, namespace: str, name: str):
         context_name: The Kubernetes context name
         namespace: The Kubernetes namespace
         name: The StatefulSet name
+        timeout: Optional read timeout in seconds of each API request (default 30)
 
     Returns:
         Status of the deletion operation
     """
     apps_v1: AppsV1Api = get_api_clients(context_name)["apps"]
-    apps_v1.delete_namespaced_stateful_set(name=name, namespace=namespace)
+    # Returns once the object is marked for deletion; dependents are garbage collected in the background
+    apps_v1.delete_namespaced_stateful_set(name=name, namespace=namespace, propagation_policy="Background",
+                                           _request_timeout=request_timeout(timeout))
+    await_write(context_name, f"/apis/apps/v1/namespaces/{namespace}/statefulsets")
     return {"name": name, "status": "Deleted"}
\ No newline at end of file